@@ -73,18 +73,63 @@ Notes
 
 from __future__ import annotations
 
+import re
 import sys
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
-from typing import Dict, List, TextIO, Tuple
+from functools import lru_cache
+from typing import (
+    Callable,
+    DefaultDict,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+)
+
+
+# ---------------------------------------------------------------------------
+# Errors
+# ---------------------------------------------------------------------------
+
+
+class CommandError(ValueError):
+    """A command line that cannot be executed as written.
+
+    Attributes
+    ----------
+    code:
+        Short machine-readable identifier of the problem; the exception
+        message is the text shown to the user. Codes are one of
+        ``usage.<command words>``, ``missing.<verb>`` and
+        ``unknown.<verb>`` (no or an unknown subcommand),
+        ``invalid.<value>`` (e.g. ``invalid.date``) and
+        ``notfound.<entity>`` (e.g. ``notfound.recipe``). A line whose
+        verb is not a command leaves ``unknown_command``.
+    """
+
+    def __init__(self, code: str, message: str) -> None:
+        super().__init__(message)
+        self.code = code
 
 
 # ---------------------------------------------------------------------------
 # Data models
 # ---------------------------------------------------------------------------
 
+# The models use ``slots=True`` so instances carry no per-instance
+# ``__dict__``; ingredients and meal plan entries never change after
+# creation and are frozen as well.
 
-@dataclass
+@dataclass(slots=True)
 class PantryItem:
     """Represents a single item stored in the digital pantry.
 
@@ -96,14 +141,27 @@ class PantryItem:
         The category of the item, e.g. ``"Dairy"``.
     expiry:
         Expiration date as a :class:`datetime.date` object.
+    expiry_ord:
+        Proleptic Gregorian ordinal of ``expiry`` (derived, not passed to
+        the constructor). Comparing plain integers is cheaper than
+        comparing :class:`datetime.date` objects in the expiry filters.
+    expiry_iso:
+        ``expiry`` formatted as ``YYYY-MM-DD`` (derived), so listing the
+        pantry does not format the same date again on every call.
     """
 
     name: str
     category: str
     expiry: date
+    expiry_ord: int = field(init=False, repr=False, compare=False)
+    expiry_iso: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.expiry_ord = self.expiry.toordinal()
+        self.expiry_iso = self.expiry.isoformat()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Ingredient:
     """Represents a single ingredient belonging to a recipe.
 
@@ -122,7 +180,7 @@ class Ingredient:
     unit: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MealPlanEntry:
     """Represents a planned recipe on a certain date.
 
@@ -138,45 +196,291 @@ class MealPlanEntry:
     scheduled_date: date
 
 
+@dataclass(frozen=True, slots=True)
+class CommandSpec:
+    """Describes how a command line is validated and executed.
+
+    Attributes
+    ----------
+    token_count:
+        Exact number of space-separated tokens, including the command
+        words themselves (e.g. ``4`` for ``add <ItemName> <Category>
+        <ExpiryDate>``).
+    usage:
+        Message shown when the line has a different number of tokens.
+    handler:
+        Function receiving the app and the tuple of tokens.
+    """
+
+    token_count: int
+    usage: str
+    handler: Callable[[FridgeSavvyApp, Tuple[str, ...]], None]
+
+
+@dataclass(frozen=True, slots=True)
+class CommandNode:
+    """One verb of the command keyword trie.
+
+    Attributes
+    ----------
+    command:
+        Name of the command run when the second word is not one of
+        ``subcommands`` (``None`` if the verb has no such default).
+    subcommands:
+        Second word -> name of the command it selects.
+    missing:
+        Message shown when the line has no second word (``None`` to run
+        ``command`` anyway and let its token count check report it).
+    unknown:
+        Message shown when the second word is not a known subcommand and
+        there is no default ``command``.
+    """
+
+    command: Optional[str] = None
+    subcommands: Mapping[str, str] = field(default_factory=dict)
+    missing: Optional[str] = None
+    unknown: Optional[str] = None
+
+
+def _command_pattern(
+    trie: Mapping[str, CommandNode], commands: Mapping[str, CommandSpec]
+) -> re.Pattern[str]:
+    """Compile the pattern matching every well-formed command line.
+
+    Each command selected by the trie gets a named group (its name with
+    spaces replaced by underscores) matching its words followed by the
+    arguments its token count leaves. A verb's default command only
+    matches when its second word is not one of the verb's subcommands, so
+    the groups never overlap and a line matches exactly when the trie
+    selects a command whose token count it has.
+    """
+    alternatives = []
+    for verb, node in trie.items():
+        names = list(node.subcommands.values())
+        if node.command is not None:
+            names.append(node.command)
+        for name in names:
+            words = name.split(" ")
+            arguments = [r"[^ ]*"] * (commands[name].token_count - len(words))
+            if name == node.command and node.subcommands:
+                subcommands = "|".join(map(re.escape, node.subcommands))
+                arguments[0] = rf"(?!(?:{subcommands})(?: |$))" + arguments[0]
+            group = name.replace(" ", "_")
+            line = " ".join(list(map(re.escape, words)) + arguments)
+            alternatives.append(f"(?P<{group}>{line})")
+    return re.compile("|".join(alternatives))
+
+
 class FridgeSavvyApp:
     """Encapsulates the in-memory state and command handling logic.
 
+    Names that are stored (item, category, recipe, ingredient and unit
+    names) are interned with :func:`sys.intern`, so equal names parsed from
+    different command lines are the same object and set/dict membership
+    tests succeed on the identity check.
+
     The class maintains:
 
-    * A list of pantry items.
+    * A list of pantry items, kept sorted by expiry date.
     * A mapping from recipe name to ingredients.
-    * A list of meal plan entries.
+    * A mapping of meal plan entries, keyed by an increasing plan id.
 
     Each public method whose name starts with ``do_`` corresponds to a
-    supported command and is invoked by :meth:`handle_command`.
+    supported command and is invoked by :meth:`handle_command`, through
+    the command table, with a token list of the expected length.
     """
 
+    # Every instance attribute is declared here, so instances carry no
+    # per-instance __dict__. See __init__ for what each one holds.
+    __slots__ = (
+        "pantry",
+        "recipes",
+        "meal_plan",
+        "_next_plan_id",
+        "_pantry_keys",
+        "_next_item_number",
+        "_pantry_by_name",
+        "_pantry_version",
+        "_available_cache",
+        "_available_cache_key",
+        "_ingredient_bits",
+        "_recipe_masks",
+        "_ing_names",
+        "_ing_units",
+        "_ing_quantities",
+        "_recipe_slices",
+        "_recipe_arrays_dirty",
+        "_plan_index",
+        "_plans_by_recipe",
+        "last_error_code",
+    )
+
+    # Command keyword trie: verb -> node naming the command selected by the
+    # second word. Together with the command table at the end of the class
+    # it is the whole command grammar; _COMMAND_RE is compiled from both.
+    _COMMAND_TRIE: Dict[str, CommandNode] = {
+        "add": CommandNode(
+            command="add",
+            subcommands={"ingredient": "add ingredient"},
+            missing="Incomplete 'add' command.",
+        ),
+        "remove": CommandNode(
+            command="remove",
+            subcommands={
+                "ingredient": "remove ingredient",
+                "recipe": "remove recipe",
+            },
+            missing="Incomplete 'remove' command.",
+        ),
+        "create": CommandNode(
+            subcommands={"recipe": "create recipe"},
+            missing="Usage: create recipe <RecipeName>",
+            unknown="Usage: create recipe <RecipeName>",
+        ),
+        "plan": CommandNode(command="plan"),
+        "unplan": CommandNode(command="unplan"),
+        "list": CommandNode(
+            subcommands={
+                "pantry": "list pantry",
+                "recipe": "list recipe",
+                "expiring": "list expiring",
+            },
+            missing="Usage: list pantry | list recipe <RecipeName> | list expiring",
+            unknown="Unknown 'list' command. Use 'pantry', 'recipe', or 'expiring'.",
+        ),
+        "suggest": CommandNode(
+            subcommands={"recipes": "suggest recipes"},
+            missing="Usage: suggest recipes",
+            unknown="Usage: suggest recipes",
+        ),
+        "generate": CommandNode(
+            subcommands={"list": "generate list"},
+            missing="Usage: generate list",
+            unknown="Usage: generate list",
+        ),
+    }
+
     def __init__(self) -> None:
         # In-memory storage (no database, no files, no external APIs).
         self.pantry: List[PantryItem] = []
         self.recipes: Dict[str, Dict[str, Ingredient]] = {}
-        self.meal_plan: List[MealPlanEntry] = []
+        self.meal_plan: Dict[int, MealPlanEntry] = {}
+        self._next_plan_id = 0
+
+        # Sort keys of the pantry items, parallel to ``self.pantry``. Each
+        # key is ``(expiry_ord, insertion number)``, so the pantry stays in
+        # expiry order and items expiring on the same day keep the order in
+        # which they were added.
+        self._pantry_keys: List[Tuple[int, int]] = []
+        self._next_item_number = 0
+
+        # Sort keys of the pantry items by name (in insertion order) so
+        # that 'remove <ItemName>' does not have to scan the whole pantry.
+        self._pantry_by_name: Dict[str, Deque[Tuple[int, int]]] = {}
+
+        # Names of the non-expired pantry items, cached for the pantry
+        # version and date they were computed for. The version is bumped
+        # on every pantry change.
+        self._pantry_version = 0
+        self._available_cache: FrozenSet[str] = frozenset()
+        self._available_cache_key: Optional[Tuple[int, int]] = None
+
+        # Bitmasks used by 'suggest recipes': every ingredient name ever
+        # added to a recipe gets a bit number, and each recipe's mask has
+        # the bits of its ingredients set. A recipe's cached mask is
+        # dropped whenever its ingredients change.
+        self._ingredient_bits: Dict[str, int] = {}
+        self._recipe_masks: Dict[str, int] = {}
+
+        # Flat, column-wise copy of all recipe ingredients used by
+        # 'generate list': parallel name/unit/quantity lists, plus the
+        # (start, end) range of each recipe in them. Rebuilt lazily after
+        # any recipe change.
+        self._ing_names: List[str] = []
+        self._ing_units: List[str] = []
+        self._ing_quantities: List[float] = []
+        self._recipe_slices: Dict[str, Tuple[int, int]] = {}
+        self._recipe_arrays_dirty = False
+
+        # Indexes over the meal plan: plan ids per (recipe, date) in the
+        # order they were planned, and the planned dates per recipe.
+        self._plan_index: Dict[Tuple[str, date], Deque[int]] = {}
+        self._plans_by_recipe: Dict[str, Set[date]] = {}
+
+        # Code of the error reported by the last handled command (see
+        # CommandError), or None if it reported no error.
+        self.last_error_code: Optional[str] = None
+
+    def reset(self) -> None:
+        """Discard all pantry, recipe and meal plan data.
+
+        The containers are cleared in place, so an instance can be reused
+        (e.g. across tests) instead of building a new one.
+        """
+        self.pantry.clear()
+        self.recipes.clear()
+        self.meal_plan.clear()
+        self._next_plan_id = 0
+
+        self._pantry_keys.clear()
+        self._next_item_number = 0
+        self._pantry_by_name.clear()
+
+        self._pantry_version = 0
+        self._available_cache = frozenset()
+        self._available_cache_key = None
+
+        self._ingredient_bits.clear()
+        self._recipe_masks.clear()
+
+        self._ing_names.clear()
+        self._ing_units.clear()
+        self._ing_quantities.clear()
+        self._recipe_slices.clear()
+        self._recipe_arrays_dirty = False
+
+        self._plan_index.clear()
+        self._plans_by_recipe.clear()
+
+        self.last_error_code = None
 
     # ------------------------------------------------------------------
     # Utility helpers
     # ------------------------------------------------------------------
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def _parse_date(value: str) -> date:
         """Parse a ``YYYY-MM-DD`` date string.
 
+        Results are memoized, since command scripts tend to reuse the same
+        few dates and :class:`datetime.date` objects are immutable. Invalid
+        dates raise every time (exceptions are not cached).
+
         Raises
         ------
-        ValueError
+        CommandError
             If the string is not a valid date in the expected format.
         """
         try:
             return date.fromisoformat(value)
         except ValueError as exc:
-            raise ValueError(
-                f"Invalid date '{value}'. Expected format: YYYY-MM-DD."
+            raise CommandError(
+                "invalid.date",
+                f"Invalid date '{value}'. Expected format: YYYY-MM-DD.",
             ) from exc
 
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _tokenize(line: str, max_splits: int) -> Tuple[str, ...]:
+        """Split a command line on single spaces, at most ``max_splits`` times.
+
+        Results are memoized, since scripts and test suites repeat the same
+        command lines; they are returned as tuples so a cached value cannot
+        be modified by its caller.
+        """
+        return tuple(line.split(" ", max_splits))
+
     @staticmethod
     def _parse_quantity(value: str) -> float:
         """Parse a numeric quantity into a float.
@@ -185,13 +489,94 @@ class FridgeSavvyApp:
 
         Raises
         ------
-        ValueError
+        CommandError
             If the value cannot be converted to a number.
         """
         try:
             return float(value)
         except ValueError as exc:
-            raise ValueError(f"Invalid quantity '{value}'. Expected a number.") from exc
+            raise CommandError(
+                "invalid.quantity", f"Invalid quantity '{value}'. Expected a number."
+            ) from exc
+
+    @staticmethod
+    def _peek_subcommand(line: str) -> Optional[str]:
+        """Return the second word of a command line.
+
+        Returns ``None`` if the line consists of a single word. Only the
+        first two words are looked at; the rest of the line is not split.
+        """
+        _, sep, rest = line.partition(" ")
+        if not sep:
+            return None
+        return rest.partition(" ")[0]
+
+    def _recipe_changed(self, recipe_name: str) -> None:
+        """Invalidate the cached data derived from a recipe."""
+        self._recipe_masks.pop(recipe_name, None)
+        self._recipe_arrays_dirty = True
+
+    def _rebuild_recipe_arrays(self) -> None:
+        """Rebuild the flat ingredient lists from ``self.recipes``."""
+        names: List[str] = []
+        units: List[str] = []
+        quantities: List[float] = []
+        slices: Dict[str, Tuple[int, int]] = {}
+        for recipe_name, ingredients in self.recipes.items():
+            start = len(names)
+            for ingredient in ingredients.values():
+                names.append(ingredient.name)
+                units.append(ingredient.unit)
+                quantities.append(ingredient.quantity)
+            slices[recipe_name] = (start, len(names))
+        self._ing_names = names
+        self._ing_units = units
+        self._ing_quantities = quantities
+        self._recipe_slices = slices
+        self._recipe_arrays_dirty = False
+
+    def _recipe_mask(self, recipe_name: str) -> int:
+        """Return the ingredient bitmask of an existing recipe.
+
+        The mask is built on first use and cached until the recipe is
+        modified.
+        """
+        mask = self._recipe_masks.get(recipe_name)
+        if mask is None:
+            bits = self._ingredient_bits
+            mask = 0
+            for ingredient_name in self.recipes[recipe_name]:
+                mask |= 1 << bits[ingredient_name]
+            self._recipe_masks[recipe_name] = mask
+        return mask
+
+    def _available_names(self) -> FrozenSet[str]:
+        """Return the names of all non-expired pantry items.
+
+        Since the pantry is sorted by expiry, the non-expired items are the
+        tail of the list starting at today's ordinal. The result is reused
+        until the pantry changes or the date changes.
+        """
+        today_ord = self._today().toordinal()
+        cache_key = (self._pantry_version, today_ord)
+        if self._available_cache_key != cache_key:
+            lo = bisect_left(self._pantry_keys, (today_ord,))
+            self._available_cache = frozenset(
+                item.name for item in self.pantry[lo:]
+            )
+            self._available_cache_key = cache_key
+        return self._available_cache
+
+    @staticmethod
+    def _emit(lines: List[str]) -> None:
+        """Write several output lines to standard output in one call.
+
+        The text goes through ``sys.stdout`` itself, not its binary
+        ``buffer``: bypassing the text layer would reorder this output with
+        respect to preceding ``print()`` calls (unless flushed every time)
+        and would not work when stdout is replaced by a text stream.
+        """
+        sys.stdout.write("\n".join(lines) + "\n")
 
     @staticmethod
     def _today() -> date:
@@ -224,101 +609,295 @@ class FridgeSavvyApp:
         * Commands are case-sensitive.
         * Words are separated by single spaces as specified.
         """
+        self.last_error_code = None
         stripped = line.strip()
         if not stripped:
             # Empty line: ignore and keep running.
             print("Enter a command")
             return True
 
-        tokens = stripped.split(" ")
+        # Well-formed lines are recognised in a single regex match, which
+        # also checks their token count, and go straight to the handler.
+        match = self._COMMAND_RE.fullmatch(stripped)
+        if match is not None:
+            spec = self._COMMANDS[self._COMMAND_GROUPS[match.lastgroup]]
+            try:
+                spec.handler(self, self._tokenize(stripped, spec.token_count))
+            except ValueError as exc:
+                self._report_error(exc)
+            return True
+
+        # Anything else: exit/help, or a line with an unknown or misused
+        # command, resolved word by word through the trie.
+        verb = stripped.partition(" ")[0]
 
         # Exit commands -------------------------------------------------
-        if tokens[0] in {"exit", "quit"}:
+        if verb in {"exit", "quit"}:
             print("Goodbye!")
             return False
 
-        # Help command --------------------------------------------------
-        if tokens[0] == "help":
+        if verb == "help":
             self.print_help()
             return True
 
+        node = self._COMMAND_TRIE.get(verb)
+        if node is None:
+            self.last_error_code = "unknown_command"
+            print(f"Error: Unknown command '{verb}'. Type 'help' for a list of commands.")
+            return True
+
         try:
-            if tokens[0] == "add":
-                self._handle_add(tokens)
-            elif tokens[0] == "remove":
-                self._handle_remove(tokens)
-            elif tokens[0] == "create":
-                self._handle_create(tokens)
-            elif tokens[0] == "plan":
-                self._handle_plan(tokens)
-            elif tokens[0] == "unplan":
-                self._handle_unplan(tokens)
-            elif tokens[0] == "list":
-                self._handle_list(tokens)
-            elif tokens[0] == "suggest":
-                self._handle_suggest(tokens)
-            elif tokens[0] == "generate":
-                self._handle_generate(tokens)
-            else:
-                print(f"Error: Unknown command '{tokens[0]}'. Type 'help' for a list of commands.")
-        except ValueError as exc:
-            # Any parsing-related error is shown to the user in a friendly manner.
-            print(f"Error: {exc}")
+            name = self._resolve_command(verb, node, stripped)
+        except CommandError as exc:
+            self._report_error(exc)
+        else:
+            # The line selects a command but did not match _COMMAND_RE, so
+            # it has the wrong number of tokens for that command.
+            self._report_error(self._usage_error(name))
+
+        return True
 
+    def _report_error(self, exc: ValueError) -> None:
+        """Print a command error and record its code in ``last_error_code``.
+
+        Errors that are not :class:`CommandError` get the generic code
+        ``"error"``.
+        """
+        self.last_error_code = getattr(exc, "code", "error")
+        print(f"Error: {exc}")
+
+    def handle_commands(self, lines: Iterable[str]) -> bool:
+        """Execute a sequence of command lines in order.
+
+        Processing stops at the first ``exit`` or ``quit`` command.
+
+        Returns
+        -------
+        bool
+            ``True`` if every line was processed, ``False`` if an exit
+            command ended the batch early.
+        """
+        handle = self.handle_command
+        for line in lines:
+            if not handle(line):
+                return False
         return True
 
+    def _resolve_command(self, verb: str, node: CommandNode, line: str) -> str:
+        """Return the name of the command a line selects below its verb.
+
+        Raises
+        ------
+        CommandError
+            With the node's message if the second word is missing
+            (``missing.<verb>``) or is not a subcommand of a verb that has
+            no default command (``unknown.<verb>``).
+        """
+        if not node.subcommands:
+            return node.command
+        subcommand = self._peek_subcommand(line)
+        if subcommand is None and node.missing is not None:
+            raise CommandError(f"missing.{verb}", node.missing)
+        name = node.subcommands.get(subcommand, node.command)
+        if name is None:
+            raise CommandError(f"unknown.{verb}", node.unknown)
+        return name
+
+    def _usage_error(self, name: str) -> CommandError:
+        """Return the error reported for a command with the wrong token count.
+
+        Its message is the command's usage message and its code is
+        ``usage.`` followed by the command's words joined by dots.
+        """
+        return CommandError("usage." + name.replace(" ", "."), self._COMMANDS[name].usage)
+
     # ------------------------------------------------------------------
-    # Command handlers
+    # State changes
     # ------------------------------------------------------------------
+    #
+    # These methods take already-parsed values and print nothing; the
+    # command handlers below parse their tokens, call them and report the
+    # result. Code that only needs to build state (tests, scripts) can call
+    # them directly and skip tokenizing, date parsing and dispatch.
+
+    def add_item(self, name: str, category: str, expiry: date) -> PantryItem:
+        """Add an item to the pantry and return it."""
+        item = PantryItem(
+            name=sys.intern(name), category=sys.intern(category), expiry=expiry
+        )
+        key = (item.expiry_ord, self._next_item_number)
+        self._next_item_number += 1
+        idx = bisect_right(self._pantry_keys, key)
+        self._pantry_keys.insert(idx, key)
+        self.pantry.insert(idx, item)
+        self._pantry_by_name.setdefault(item.name, deque()).append(key)
+        self._pantry_version += 1
+        return item
+
+    def remove_item(self, name: str) -> bool:
+        """Remove the earliest added pantry item with a name.
+
+        Returns ``False`` if there is no item with that name.
+        """
+        same_name = self._pantry_by_name.get(name)
+        if not same_name:
+            return False
 
-    # ADD -------------------------------------------------------------
+        # The deque keeps items in insertion order, so the earliest added
+        # item is at the left end.
+        key = same_name.popleft()
+        if not same_name:
+            del self._pantry_by_name[name]
+        # The pantry must stay sorted by expiry, so the item is deleted in
+        # place (a memmove of the tail) rather than swapped with the last
+        # item and popped.
+        idx = bisect_left(self._pantry_keys, key)
+        del self._pantry_keys[idx]
+        del self.pantry[idx]
+        self._pantry_version += 1
+        return True
 
-    def _handle_add(self, tokens: List[str]) -> None:
-        """Handle all ``add ...`` commands."""
-        if len(tokens) < 2:
-            raise ValueError("Incomplete 'add' command.")
+    def create_recipe(self, name: str) -> bool:
+        """Create an empty recipe.
 
-        if tokens[1] == "ingredient":
-            self.do_add_ingredient(tokens)
-        else:
-            self.do_add_pantry_item(tokens)
+        Returns ``False``, leaving the recipe unchanged, if it already
+        exists.
+        """
+        if name in self.recipes:
+            return False
+        self.recipes[sys.intern(name)] = {}
+        self._recipe_changed(name)
+        return True
+
+    def add_ingredient(
+        self, recipe_name: str, name: str, quantity: float, unit: str
+    ) -> Ingredient:
+        """Add an ingredient to a recipe, replacing one with the same name.
 
-    def do_add_pantry_item(self, tokens: List[str]) -> None:
+        Raises
+        ------
+        CommandError
+            With code ``notfound.recipe`` if the recipe does not exist.
+        """
+        if recipe_name not in self.recipes:
+            raise CommandError(
+                "notfound.recipe", f"Recipe '{recipe_name}' does not exist. Create it first."
+            )
+        name = sys.intern(name)
+        ingredient = Ingredient(name=name, quantity=quantity, unit=sys.intern(unit))
+        self.recipes[recipe_name][name] = ingredient
+        self._ingredient_bits.setdefault(name, len(self._ingredient_bits))
+        self._recipe_changed(recipe_name)
+        return ingredient
+
+    def remove_ingredient(self, recipe_name: str, name: str) -> bool:
+        """Remove an ingredient from a recipe.
+
+        Returns ``False`` if the recipe has no ingredient with that name.
+
+        Raises
+        ------
+        CommandError
+            With code ``notfound.recipe`` if the recipe does not exist.
+        """
+        ingredients = self.recipes.get(recipe_name)
+        if ingredients is None:
+            raise CommandError("notfound.recipe", f"No recipe named '{recipe_name}' found.")
+        if name not in ingredients:
+            return False
+        del ingredients[name]
+        self._recipe_changed(recipe_name)
+        return True
+
+    def plan_recipe(self, recipe_name: str, scheduled_date: date) -> int:
+        """Plan a recipe on a date and return the new plan id.
+
+        Raises
+        ------
+        CommandError
+            With code ``notfound.recipe`` if the recipe does not exist.
+        """
+        if recipe_name not in self.recipes:
+            raise CommandError("notfound.recipe", f"Recipe '{recipe_name}' does not exist.")
+        recipe_name = sys.intern(recipe_name)
+        plan_id = self._next_plan_id
+        self._next_plan_id += 1
+        self.meal_plan[plan_id] = MealPlanEntry(
+            recipe_name=recipe_name, scheduled_date=scheduled_date
+        )
+        key = (recipe_name, scheduled_date)
+        self._plan_index.setdefault(key, deque()).append(plan_id)
+        self._plans_by_recipe.setdefault(recipe_name, set()).add(scheduled_date)
+        return plan_id
+
+    def unplan_recipe(self, recipe_name: str, scheduled_date: date) -> bool:
+        """Remove the earliest planned occurrence of a recipe on a date.
+
+        Returns ``False`` if the recipe is not planned on that date.
+        """
+        key = (recipe_name, scheduled_date)
+        plan_ids = self._plan_index.get(key)
+        if not plan_ids:
+            return False
+
+        del self.meal_plan[plan_ids.popleft()]
+        if not plan_ids:
+            del self._plan_index[key]
+            dates = self._plans_by_recipe[recipe_name]
+            dates.discard(scheduled_date)
+            if not dates:
+                del self._plans_by_recipe[recipe_name]
+        return True
+
+    def remove_recipe(self, name: str) -> Optional[int]:
+        """Remove a recipe together with its meal plan entries.
+
+        Returns the number of meal plan entries removed, or ``None`` if
+        there is no such recipe.
+        """
+        if name not in self.recipes:
+            return None
+        del self.recipes[name]
+        self._recipe_changed(name)
+        removed_from_plan = 0
+        for scheduled_date in self._plans_by_recipe.pop(name, ()):
+            for plan_id in self._plan_index.pop((name, scheduled_date)):
+                del self.meal_plan[plan_id]
+                removed_from_plan += 1
+        return removed_from_plan
+
+    # ------------------------------------------------------------------
+    # Command handlers
+    # ------------------------------------------------------------------
+
+    # ADD -------------------------------------------------------------
+
+    def do_add_pantry_item(self, tokens: Tuple[str, ...]) -> None:
         """Implementation of::
 
             add <ItemName> <Category> <ExpiryDate>
         """
-        if len(tokens) != 4:
-            raise ValueError("Usage: add <ItemName> <Category> <ExpiryDate>")
-
         _, item_name, category, expiry_str = tokens
         expiry = self._parse_date(expiry_str)
-        self.pantry.append(PantryItem(name=item_name, category=category, expiry=expiry))
+        self.add_item(item_name, category, expiry)
         print(f"Added item '{item_name}' in category '{category}' with expiry {expiry}.")
 
-    def do_add_ingredient(self, tokens: List[str]) -> None:
+    def do_add_ingredient(self, tokens: Tuple[str, ...]) -> None:
         """Implementation of::
 
             add ingredient <RecipeName> <IngredientName> <Quantity> <Unit>
         """
-        if len(tokens) != 6:
-            raise ValueError(
-                "Usage: add ingredient <RecipeName> <IngredientName> <Quantity> <Unit>"
-            )
-
         _, _, recipe_name, ingredient_name, quantity_str, unit = tokens
 
-        if recipe_name not in self.recipes:
-            raise ValueError(f"Recipe '{recipe_name}' does not exist. Create it first.")
-
-        quantity = self._parse_quantity(quantity_str)
-        ingredient = Ingredient(
-            name=ingredient_name,
-            quantity=quantity,
-            unit=unit,
-        )
-        # Replace or add ingredient
-        self.recipes[recipe_name][ingredient_name] = ingredient
+        try:
+            quantity = self._parse_quantity(quantity_str)
+        except CommandError:
+            if recipe_name in self.recipes:
+                raise
+            # A missing recipe is reported before an invalid quantity:
+            # add_ingredient raises for it without using the quantity.
+            quantity = 0.0
+        self.add_ingredient(recipe_name, ingredient_name, quantity, unit)
         print(
             f"Added ingredient '{ingredient_name}' to recipe '{recipe_name}': "
             f"{quantity} {unit}."
@@ -326,82 +905,50 @@ class FridgeSavvyApp:
 
     # REMOVE ----------------------------------------------------------
 
-    def _handle_remove(self, tokens: List[str]) -> None:
-        """Handle all ``remove ...`` commands."""
-        if len(tokens) < 2:
-            raise ValueError("Incomplete 'remove' command.")
-
-        if tokens[1] == "ingredient":
-            self.do_remove_ingredient(tokens)
-        elif tokens[1] == "recipe":
-            self.do_remove_recipe(tokens)
-        else:
-            self.do_remove_pantry_item(tokens)
-
-    def do_remove_pantry_item(self, tokens: List[str]) -> None:
+    def do_remove_pantry_item(self, tokens: Tuple[str, ...]) -> None:
         """Implementation of::
 
             remove <ItemName>
 
         Removes *one* matching item from the pantry (the earliest added).
         """
-        if len(tokens) != 2:
-            raise ValueError("Usage: remove <ItemName>")
-
         _, item_name = tokens
-        for idx, item in enumerate(self.pantry):
-            if item.name == item_name:
-                del self.pantry[idx]
-                print(f"Removed item '{item_name}' from pantry.")
-                return
-
-        print(f"No pantry item named '{item_name}' found.")
+        if not self.remove_item(item_name):
+            print(f"No pantry item named '{item_name}' found.")
+            return
+        print(f"Removed item '{item_name}' from pantry.")
 
-    def do_remove_recipe(self, tokens: List[str]) -> None:
+    def do_remove_recipe(self, tokens: Tuple[str, ...]) -> None:
         """Implementation of::
 
             remove recipe <RecipeName>
         """
-        if len(tokens) != 3:
-            raise ValueError("Usage: remove recipe <RecipeName>")
-
         _, _, recipe_name = tokens
-        if recipe_name not in self.recipes:
+        removed_from_plan = self.remove_recipe(recipe_name)
+        if removed_from_plan is None:
             print(f"No recipe named '{recipe_name}' found.")
             return
 
-        # Remove the recipe
-        del self.recipes[recipe_name]
-
-        # Also remove any associated meal plan entries
-        before = len(self.meal_plan)
-        self.meal_plan = [
-            entry for entry in self.meal_plan if entry.recipe_name != recipe_name
-        ]
-        removed_from_plan = before - len(self.meal_plan)
-
         msg = f"Removed recipe '{recipe_name}'."
         if removed_from_plan:
             msg += f" Also removed {removed_from_plan} planned occurrence(s)."
         print(msg)
 
-    def do_remove_ingredient(self, tokens: List[str]) -> None:
+    def do_remove_ingredient(self, tokens: Tuple[str, ...]) -> None:
         """Implementation of::
 
             remove ingredient <RecipeName> <IngredientName>
         """
-        if len(tokens) != 4:
-            raise ValueError("Usage: remove ingredient <RecipeName> <IngredientName>")
-
         _, _, recipe_name, ingredient_name = tokens
 
-        if recipe_name not in self.recipes:
-            print(f"No recipe named '{recipe_name}' found.")
+        try:
+            removed = self.remove_ingredient(recipe_name, ingredient_name)
+        except CommandError as exc:
+            # Reported as a plain message, not an error, as before
+            print(exc)
             return
 
-        ingredients = self.recipes[recipe_name]
-        if ingredient_name in ingredients:
-            del ingredients[ingredient_name]
+        if removed:
             print(
                 f"Removed ingredient '{ingredient_name}' from recipe '{recipe_name}'."
             )
@@ -412,113 +959,76 @@ class FridgeSavvyApp:
 
     # CREATE ----------------------------------------------------------
 
-    def _handle_create(self, tokens: List[str]) -> None:
-        """Handle all ``create ...`` commands."""
-        if len(tokens) < 2 or tokens[1] != "recipe":
-            raise ValueError("Usage: create recipe <RecipeName>")
-        self.do_create_recipe(tokens)
-
-    def do_create_recipe(self, tokens: List[str]) -> None:
+    def do_create_recipe(self, tokens: Tuple[str, ...]) -> None:
         """Implementation of::
 
             create recipe <RecipeName>
         """
-        if len(tokens) != 3:
-            raise ValueError("Usage: create recipe <RecipeName>")
-
         _, _, recipe_name = tokens
 
-        if recipe_name in self.recipes:
+        if not self.create_recipe(recipe_name):
             print(f"Recipe '{recipe_name}' already exists.")
             return
 
-        self.recipes[recipe_name] = {}
         print(f"Created empty recipe '{recipe_name}'.")
 
     # PLAN / UNPLAN ---------------------------------------------------
 
-    def _handle_plan(self, tokens: List[str]) -> None:
+    def do_plan_recipe(self, tokens: Tuple[str, ...]) -> None:
         """Implementation of::
 
             plan <RecipeName> <Date>
         """
-        self.do_plan_recipe(tokens)
-
-    def do_plan_recipe(self, tokens: List[str]) -> None:
-        if len(tokens) != 3:
-            raise ValueError("Usage: plan <RecipeName> <Date>")
-
         _, recipe_name, date_str = tokens
-        if recipe_name not in self.recipes:
-            raise ValueError(f"Recipe '{recipe_name}' does not exist.")
-
-        scheduled_date = self._parse_date(date_str)
-        self.meal_plan.append(MealPlanEntry(recipe_name=recipe_name, scheduled_date=scheduled_date))
+        try:
+            scheduled_date = self._parse_date(date_str)
+        except CommandError:
+            if recipe_name in self.recipes:
+                raise
+            # A missing recipe is reported before an invalid date, as for
+            # 'add ingredient'.
+            scheduled_date = date.min
+        self.plan_recipe(recipe_name, scheduled_date)
         print(f"Planned recipe '{recipe_name}' on {scheduled_date}.")
 
-    def _handle_unplan(self, tokens: List[str]) -> None:
+    def do_unplan_recipe(self, tokens: Tuple[str, ...]) -> None:
         """Implementation of::
 
             unplan <RecipeName> <Date>
         """
-        self.do_unplan_recipe(tokens)
-
-    def do_unplan_recipe(self, tokens: List[str]) -> None:
-        if len(tokens) != 3:
-            raise ValueError("Usage: unplan <RecipeName> <Date>")
-
         _, recipe_name, date_str = tokens
         scheduled_date = self._parse_date(date_str)
 
-        for idx, entry in enumerate(self.meal_plan):
-            if entry.recipe_name == recipe_name and entry.scheduled_date == scheduled_date:
-                del self.meal_plan[idx]
-                print(f"Removed planned recipe '{recipe_name}' on {scheduled_date}.")
-                return
-
-        print(f"No planned recipe '{recipe_name}' on {scheduled_date} found.")
+        if not self.unplan_recipe(recipe_name, scheduled_date):
+            print(f"No planned recipe '{recipe_name}' on {scheduled_date} found.")
+            return
+        print(f"Removed planned recipe '{recipe_name}' on {scheduled_date}.")
 
     # LIST ------------------------------------------------------------
 
-    def _handle_list(self, tokens: List[str]) -> None:
-        """Handle all ``list ...`` commands."""
-        if len(tokens) < 2:
-            raise ValueError("Usage: list pantry | list recipe <RecipeName> | list expiring")
-
-        if tokens[1] == "pantry":
-            self.do_list_pantry(tokens)
-        elif tokens[1] == "recipe":
-            self.do_list_recipe(tokens)
-        elif tokens[1] == "expiring":
-            self.do_list_expiring(tokens)
-        else:
-            raise ValueError("Unknown 'list' command. Use 'pantry', 'recipe', or 'expiring'.")
-
-    def do_list_pantry(self, tokens: List[str]) -> None:
+    def do_list_pantry(self, tokens: Tuple[str, ...]) -> None:
         """Implementation of::
 
             list pantry
         """
-        if len(tokens) != 2:
-            raise ValueError("Usage: list pantry")
-
         if not self.pantry:
             print("Pantry is empty.")
             return
 
-        print("Pantry items:")
-        # Sort by expiry date for convenience
-        for item in sorted(self.pantry, key=lambda i: i.expiry):
-            print(f"- {item.name} ({item.category}) – Expires {item.expiry}")
+        # The pantry is already kept sorted by expiry date
+        template = self._PANTRY_LINE
+        lines = ["Pantry items:"]
+        lines += [
+            template % (item.name, item.category, item.expiry_iso)
+            for item in self.pantry
+        ]
+        self._emit(lines)
 
-    def do_list_recipe(self, tokens: List[str]) -> None:
+    def do_list_recipe(self, tokens: Tuple[str, ...]) -> None:
         """Implementation of::
 
             list recipe <RecipeName>
         """
-        if len(tokens) != 3:
-            raise ValueError("Usage: list recipe <RecipeName>")
-
         _, _, recipe_name = tokens
         if recipe_name not in self.recipes:
             print(f"No recipe named '{recipe_name}' found.")
@@ -529,45 +1039,48 @@ class FridgeSavvyApp:
             print(f"Recipe '{recipe_name}' has no ingredients.")
             return
 
-        print(f"Ingredients for recipe '{recipe_name}':")
-        for ingredient in ingredients.values():
-            print(f"{ingredient.name} – {ingredient.quantity} {ingredient.unit}")
+        lines = [f"Ingredients for recipe '{recipe_name}':"]
+        template = self._INGREDIENT_LINE
+        lines += [
+            template % (ingredient.name, ingredient.quantity, ingredient.unit)
+            for ingredient in ingredients.values()
+        ]
+        self._emit(lines)
 
-    def do_list_expiring(self, tokens: List[str]) -> None:
+    def do_list_expiring(self, tokens: Tuple[str, ...]) -> None:
         """Implementation of::
 
             list expiring
 
         Shows items expiring within 3 days from *today* (inclusive).
         """
-        if len(tokens) != 2:
-            raise ValueError("Usage: list expiring")
-
         today = self._today()
         cutoff = today + timedelta(days=3)
+        today_ord = today.toordinal()
+        cutoff_ord = cutoff.toordinal()
 
-        expiring_items = [
-            item for item in self.pantry
-            if today <= item.expiry <= cutoff
-        ]
+        # The pantry is sorted by expiry, so the expiring items form a
+        # contiguous slice that can be located by binary search.
+        lo = bisect_left(self._pantry_keys, (today_ord,))
+        hi = bisect_left(self._pantry_keys, (cutoff_ord + 1,), lo)
+        expiring_items = self.pantry[lo:hi]
 
         if not expiring_items:
             print("No items expiring within the next 3 days.")
             return
 
-        print(f"Items expiring between {today} and {cutoff}:")
-        for item in sorted(expiring_items, key=lambda i: i.expiry):
-            days_left = (item.expiry - today).days
-            print(f"- {item.name} ({item.category}) – Expires {item.expiry} (in {days_left} day(s))")
+        template = self._EXPIRING_LINE
+        lines = [f"Items expiring between {today} and {cutoff}:"]
+        lines += [
+            template % (
+                item.name, item.category, item.expiry_iso, item.expiry_ord - today_ord
+            )
+            for item in expiring_items
+        ]
+        self._emit(lines)
 
     # SUGGEST RECIPES -------------------------------------------------
 
-    def _handle_suggest(self, tokens: List[str]) -> None:
-        """Handle the ``suggest recipes`` command."""
-        if len(tokens) != 2 or tokens[1] != "recipes":
-            raise ValueError("Usage: suggest recipes")
-        self.do_suggest_recipes()
-
     def do_suggest_recipes(self) -> None:
         """Suggest recipes based on current (non-expired) pantry contents.
 
@@ -582,38 +1095,40 @@ class FridgeSavvyApp:
             print("No recipes available.")
             return
 
-        today = self._today()
-        available_items = {item.name for item in self.pantry if item.expiry >= today}
+        available_items = self._available_names()
 
         if not available_items:
             print("Pantry is empty or all items are expired. No recipe suggestions.")
             return
 
+        # Set the bit of every available name that is used by a recipe;
+        # a recipe can be prepared if its mask is contained in this one.
+        pantry_mask = 0
+        bits = self._ingredient_bits
+        for name in available_items:
+            bit = bits.get(name)
+            if bit is not None:
+                pantry_mask |= 1 << bit
+
         matching_recipes: List[str] = []
 
         for recipe_name, ingredients in self.recipes.items():
             if not ingredients:
                 continue  # skip empty recipes
-            ingredient_names = {ing.name for ing in ingredients.values()}
-            if ingredient_names.issubset(available_items):
+            mask = self._recipe_mask(recipe_name)
+            if pantry_mask & mask == mask:
                 matching_recipes.append(recipe_name)
 
         if not matching_recipes:
             print("No recipes can be fully prepared with current pantry items.")
             return
 
-        print("You can prepare the following recipes with your current pantry:")
-        for name in sorted(matching_recipes):
-            print(f"- {name}")
+        lines = ["You can prepare the following recipes with your current pantry:"]
+        lines += [f"- {name}" for name in sorted(matching_recipes)]
+        self._emit(lines)
 
     # GENERATE SHOPPING LIST -----------------------------------------
 
-    def _handle_generate(self, tokens: List[str]) -> None:
-        """Handle the ``generate list`` command."""
-        if len(tokens) != 2 or tokens[1] != "list":
-            raise ValueError("Usage: generate list")
-        self.do_generate_list()
-
     def do_generate_list(self) -> None:
         """Generate a shopping list based on planned meals.
 
@@ -625,7 +1140,9 @@ class FridgeSavvyApp:
         shopping list.
 
         Quantities for the same ingredient (with the same unit) are
-        summed across all planned meals.
+        summed across all planned meals, one meal at a time in the order
+        they were planned, so fractional totals round the same way
+        whatever the plan looks like.
         """
         
         if not self.recipes:
@@ -638,59 +1155,151 @@ class FridgeSavvyApp:
 
         
 
-        today = self._today()
-        available_items = {item.name for item in self.pantry if item.expiry >= today}
+        available_items = self._available_names()
 
         # Key: (ingredient_name, unit) -> total quantity
-        required: Dict[Tuple[str, str], float] = {}
-
-        for entry in self.meal_plan:
-            recipe_name = entry.recipe_name
-            ingredients = self.recipes.get(recipe_name)
-            if not ingredients:
+        required: DefaultDict[Tuple[str, str], float] = defaultdict(float)
+
+        if self._recipe_arrays_dirty:
+            self._rebuild_recipe_arrays()
+        names = self._ing_names
+        units = self._ing_units
+        quantities = self._ing_quantities
+
+        slices = self._recipe_slices
+        for entry in self.meal_plan.values():
+            bounds = slices.get(entry.recipe_name)
+            if bounds is None:
                 # Should not happen if commands are used correctly,
                 # but we handle it defensively.
                 continue
 
-            for ingredient in ingredients.values():
-                if ingredient.name in available_items:
+            for i in range(*bounds):
+                name = names[i]
+                if name in available_items:
                     continue  # already available in pantry
-                key = (ingredient.name, ingredient.unit)
-                required[key] = required.get(key, 0.0) + ingredient.quantity
+                required[(name, units[i])] += quantities[i]
 
         if not required:
             print("All planned ingredients are already available in your pantry. "
                   "No shopping needed!")
             return
 
-        print("Shopping list (missing ingredients for planned meals):")
-        for (name, unit), qty in sorted(required.items(), key=lambda kv: kv[0][0]):
-            # Remove insignificant decimals if quantity is effectively an integer
-            qty_str = str(int(qty))
-            print(f"- {name} – {qty_str} {unit}")
+        # %d truncates the quantity to an integer, dropping decimals
+        template = self._SHOPPING_LINE
+        lines = ["Shopping list (missing ingredients for planned meals):"]
+        try:
+            for (name, unit), qty in sorted(required.items(), key=lambda kv: kv[0][0]):
+                lines.append(template % (name, qty, unit))
+        finally:
+            # %d rejects NaN and infinite quantities; the header and the
+            # lines before the failing one are still written first.
+            self._emit(lines)
 
     # ------------------------------------------------------------------
-    # Helper: help text
+    # Helper: output templates and help text
     # ------------------------------------------------------------------
 
+    # printf-style templates for the lines of the listing commands.
+    _PANTRY_LINE = "- %s (%s) – Expires %s"
+    _INGREDIENT_LINE = "%s – %s %s"
+    _EXPIRING_LINE = "- %s (%s) – Expires %s (in %d day(s))"
+    _SHOPPING_LINE = "- %s – %d %s"
+
+    _HELP_TEXT = (
+        "Available commands:\n"
+        "  add <ItemName> <Category> <ExpiryDate>\n"
+        "  remove <ItemName>\n"
+        "  create recipe <RecipeName>\n"
+        "  remove recipe <RecipeName>\n"
+        "  add ingredient <RecipeName> <IngredientName> <Quantity> <Unit>\n"
+        "  remove ingredient <RecipeName> <IngredientName>\n"
+        "  plan <RecipeName> <Date>\n"
+        "  unplan <RecipeName> <Date>\n"
+        "  list pantry\n"
+        "  list recipe <RecipeName>\n"
+        "  list expiring\n"
+        "  suggest recipes\n"
+        "  generate list\n"
+        "  help\n"
+        "  exit | quit\n"
+    )
+
     def print_help(self) -> None:
         """Print a concise list of supported commands."""
-        print("Available commands:")
-        print("  add <ItemName> <Category> <ExpiryDate>")
-        print("  remove <ItemName>")
-        print("  create recipe <RecipeName>")
-        print("  remove recipe <RecipeName>")
-        print("  add ingredient <RecipeName> <IngredientName> <Quantity> <Unit>")
-        print("  remove ingredient <RecipeName> <IngredientName>")
-        print("  plan <RecipeName> <Date>")
-        print("  unplan <RecipeName> <Date>")
-        print("  list pantry")
-        print("  list recipe <RecipeName>")
-        print("  list expiring")
-        print("  suggest recipes")
-        print("  generate list")
-        print("  help")
-        print("  exit | quit")
+        sys.stdout.write(self._HELP_TEXT)
+
+    # ------------------------------------------------------------------
+    # Command table
+    # ------------------------------------------------------------------
+
+    # Command name -> expected token count, usage message and handler. It
+    # is defined after the handlers it refers to; handle_command only calls
+    # a handler for a line matching _COMMAND_RE, whose groups enforce the
+    # token counts, so handlers only ever see well-formed token lists.
+    _COMMANDS: Dict[str, CommandSpec] = {
+        "add": CommandSpec(
+            4, "Usage: add <ItemName> <Category> <ExpiryDate>",
+            do_add_pantry_item,
+        ),
+        "add ingredient": CommandSpec(
+            6, "Usage: add ingredient <RecipeName> <IngredientName> <Quantity> <Unit>",
+            do_add_ingredient,
+        ),
+        "remove": CommandSpec(
+            2, "Usage: remove <ItemName>",
+            do_remove_pantry_item,
+        ),
+        "remove recipe": CommandSpec(
+            3, "Usage: remove recipe <RecipeName>",
+            do_remove_recipe,
+        ),
+        "remove ingredient": CommandSpec(
+            4, "Usage: remove ingredient <RecipeName> <IngredientName>",
+            do_remove_ingredient,
+        ),
+        "create recipe": CommandSpec(
+            3, "Usage: create recipe <RecipeName>",
+            do_create_recipe,
+        ),
+        "plan": CommandSpec(
+            3, "Usage: plan <RecipeName> <Date>",
+            do_plan_recipe,
+        ),
+        "unplan": CommandSpec(
+            3, "Usage: unplan <RecipeName> <Date>",
+            do_unplan_recipe,
+        ),
+        "list pantry": CommandSpec(
+            2, "Usage: list pantry",
+            do_list_pantry,
+        ),
+        "list recipe": CommandSpec(
+            3, "Usage: list recipe <RecipeName>",
+            do_list_recipe,
+        ),
+        "list expiring": CommandSpec(
+            2, "Usage: list expiring",
+            do_list_expiring,
+        ),
+        "suggest recipes": CommandSpec(
+            2, "Usage: suggest recipes",
+            lambda app, tokens: app.do_suggest_recipes(),
+        ),
+        "generate list": CommandSpec(
+            2, "Usage: generate list",
+            lambda app, tokens: app.do_generate_list(),
+        ),
+    }
+
+    # Well-formed command lines, one named group per command (spaces in the
+    # name replaced by underscores; _COMMAND_GROUPS maps them back). A line
+    # that matches has the right words and token count for its command; any
+    # other line goes through the trie, which reports what is wrong.
+    _COMMAND_RE = _command_pattern(_COMMAND_TRIE, _COMMANDS)
+    _COMMAND_GROUPS = {
+        group: group.replace("_", " ") for group in _COMMAND_RE.groupindex
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -699,13 +1308,26 @@ class FridgeSavvyApp:
 
 
 def main() -> None:
-    """Program entry point (interactive mode only)."""
+    """Program entry point.
+
+    When standard input is a terminal the program prompts for commands
+    with :func:`input`. When commands are piped in (e.g.
+    ``python main.py < commands.txt``) the stream is read line by line
+    through the buffered ``sys.stdin`` iterator instead, which avoids the
+    per-line prompt overhead of :func:`input`.
+    """
 
     print("FridgeSavvy – Smart kitchen inventory and meal planning assistant")
     print("Type 'help' to see available commands. Type 'exit' to quit.")
 
     app = FridgeSavvyApp()
 
+    if not sys.stdin.isatty():
+        # Batch mode: no prompts, stop at 'exit'/'quit' or end of input.
+        if app.handle_commands(sys.stdin):
+            print("Goodbye!")
+        return
+
     while True:
         try:
             line = input("> ")
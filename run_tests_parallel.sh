@@ -0,0 +1,13 @@
+#!/bin/bash
+# Runs every iteration suite once, one unittest process per file, spread
+# across all CPU cores. Use run_all_tests.sh for per-iteration coverage.
+# Files that start subprocesses are queued first, so their start-up time
+# overlaps with the in-process suites instead of trailing them.
+# Any arguments are passed on to unittest, e.g. -f to stop each suite at
+# its first failure.
+JOBS=${JOBS:-$(nproc)}
+{
+    grep -l subprocess tests_iteration_*.py
+    grep -L subprocess tests_iteration_*.py
+} | xargs -P "$JOBS" -I {} \
+    python -m unittest -q "$@" {}
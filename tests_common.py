@@ -0,0 +1,445 @@
+import io
+import re
+import threading
+from contextlib import redirect_stdout
+from datetime import date, timedelta
+from unittest.mock import patch
+
+# main is imported by the helpers on first use, so loading this module (or
+# a suite that only needs its constants) does not import the application
+
+# Command sequences reused across tests, built once at import
+CMDS_ADD_MILK = ("add Milk Dairy 2025-11-01",)
+CMDS_ADD_REMOVE_MILK = CMDS_ADD_MILK + ("remove Milk",)
+CMDS_ADD_INGREDIENT = ("create recipe Salad", "add ingredient Salad Tomato 100 g")
+CMDS_ADD_REMOVE_INGREDIENT = CMDS_ADD_INGREDIENT + ("remove ingredient Salad Tomato",)
+CMDS_PLAN_SOUP = ("create recipe Soup", "plan Soup 2025-10-10")
+CMDS_PLAN_UNPLAN_SOUP = CMDS_PLAN_SOUP + ("unplan Soup 2025-10-10",)
+CMDS_SUGGEST_WITHOUT_PANTRY = (
+    "create recipe Pasta",
+    "add ingredient Pasta Tomato 1 g",
+    "suggest recipes",
+)
+
+
+class _Sink:
+    """Minimal stdout stand-in that collects written text in a list."""
+
+    __slots__ = ("parts",)
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, s):
+        self.parts.append(s)
+        return len(s)
+
+    def flush(self):
+        pass
+
+    def clear(self):
+        self.parts.clear()
+
+    def getvalue(self):
+        return "".join(self.parts)
+
+
+class _NullSink:
+    """Stdout stand-in that discards everything written to it."""
+
+    __slots__ = ()
+
+    def write(self, s):
+        return len(s)
+
+    def flush(self):
+        pass
+
+
+_NULL = _NullSink()
+_TLS = threading.local()
+_APP = None
+
+
+def _shared_app():
+    """Return the app shared by every suite in this process.
+
+    Suites reset it before each run instead of snapshotting and restoring
+    it, since every test starts from an empty app.
+    """
+    global _APP
+    if _APP is None:
+        from main import FridgeSavvyApp
+        _APP = FridgeSavvyApp()
+    return _APP
+
+
+def _sink():
+    """Return this thread's reusable output sink."""
+    sink = getattr(_TLS, "sink", None)
+    if sink is None:
+        _TLS.sink = sink = _Sink()
+    return sink
+
+
+def _capture(app, commands, sink):
+    """Run commands on app as it is and return their output."""
+    sink.clear()
+    with redirect_stdout(sink):
+        app.handle_commands(commands)
+    return sink.getvalue()
+
+
+def _run_cmds(app, commands, sink):
+    """Reset app, run commands on it and return (output, app)."""
+    app.reset()
+    return _capture(app, commands, sink), app
+
+
+def _run_quiet(app, commands):
+    """Reset app and run commands on it for their effect on its state.
+
+    The output is discarded as it is written; to build state without
+    formatting any output at all, call the app's typed API instead.
+    """
+    app.reset()
+    with redirect_stdout(_NULL):
+        app.handle_commands(commands)
+    return app
+
+
+def _run_main(stdin_text, sink):
+    """Run main() with stdin_text piped in and return its output."""
+    from main import main
+    sink.clear()
+    with patch("sys.stdin", io.StringIO(stdin_text)), redirect_stdout(sink):
+        main()
+    return sink.getvalue()
+
+
+def _run_main_interactive(lines, sink):
+    """Run main() as if at a terminal, typing lines and then end of input.
+
+    Returns main()'s output and the mock standing in for input().
+    """
+    from main import main
+    sink.clear()
+    stdin = io.StringIO()
+    with patch("sys.stdin", stdin), patch.object(stdin, "isatty", return_value=True), \
+            patch("builtins.input", side_effect=[*lines, EOFError]) as prompt, \
+            redirect_stdout(sink):
+        main()
+    return sink.getvalue(), prompt
+
+
+def _run_last(app, commands, sink):
+    """Reset app, run commands on it and return the last command's output."""
+    app.reset()
+    *setup, last = commands
+    _capture(app, setup, sink)
+    return _capture(app, (last,), sink)
+
+
+# Builders for the starting state of the longer tests. They call the app's
+# typed API directly, since only the final command's output is asserted.
+# seeded() runs each one once per process; tests work on a deep copy and
+# only run their final, asserted command through handle_command.
+def _seed_cake_tortilla_snails(app):
+    for name in ("Tortilla", "Cake", "Snails"):
+        app.create_recipe(name)
+    app.add_ingredient("Cake", "Egg", 3.0, "unit")
+    app.add_ingredient("Tortilla", "Potatoes", 4.0, "kg")
+    app.add_ingredient("Tortilla", "Egg", 4.0, "unit")
+    app.add_item("Egg", "Dairy", date(2099, 1, 1))
+
+
+def _seed_pasta_planned_then_removed(app):
+    app.create_recipe("Pasta")
+    app.create_recipe("Soup")
+    app.add_ingredient("Pasta", "Tomato", 2.0, "g")
+    app.plan_recipe("Pasta", date(2025, 10, 10))
+    app.remove_recipe("Pasta")
+
+
+def _seed_pasta_planned_with_pantry(app):
+    app.create_recipe("Pasta")
+    app.add_ingredient("Pasta", "Tomato", 2.0, "g")
+    app.add_ingredient("Pasta", "Butter", 50.0, "g")
+    app.add_item("Butter", "Dairy", date(2025, 12, 1))
+    app.add_item("Tomato", "Vegetable", date(2025, 12, 3))
+    app.plan_recipe("Pasta", date(2025, 10, 10))
+
+
+def _seed_soup_cake_snails_planned(app):
+    for name in ("Soup", "Cake", "Snails"):
+        app.create_recipe(name)
+    app.plan_recipe("Soup", date(2025, 11, 28))
+    app.plan_recipe("Cake", date(2025, 11, 15))
+    app.plan_recipe("Snails", date(2025, 12, 1))
+
+
+# The seeds below are relative to today's date when they are first built.
+def _seed_pasta_all_available(app):
+    future = date.today() + timedelta(days=30)
+    app.create_recipe("Pasta")
+    app.add_ingredient("Pasta", "Tomato", 200.0, "g")
+    app.add_ingredient("Pasta", "Cheese", 50.0, "g")
+    app.add_item("Tomato", "Vegetable", future)
+    app.add_item("Cheese", "Dairy", future)
+    app.plan_recipe("Pasta", date(2025, 12, 10))
+
+
+def _seed_salad_half_available(app):
+    future = date.today() + timedelta(days=30)
+    app.create_recipe("Salad")
+    app.add_ingredient("Salad", "Lettuce", 1.0, "head")
+    app.add_ingredient("Salad", "Tomato", 2.0, "unit")
+    app.add_item("Lettuce", "Vegetable", future)
+    app.plan_recipe("Salad", date(2025, 12, 10))
+
+
+def _seed_omelette_egg_expired(app):
+    today = date.today()
+    app.add_item("Egg", "Dairy", today - timedelta(days=10))
+    app.add_item("Tomato", "Vegetable", today + timedelta(days=30))
+    app.create_recipe("Omelette")
+    app.add_ingredient("Omelette", "Egg", 2.0, "unit")
+    app.create_recipe("Salad")
+    app.add_ingredient("Salad", "Tomato", 1.0, "unit")
+
+
+def _seed_complex_pasta_partial(app):
+    app.add_item("Tomato", "Vegetable", date.today() + timedelta(days=5))
+    app.create_recipe("ComplexPasta")
+    for name in ("Tomato", "Cheese", "Pasta"):
+        app.add_ingredient("ComplexPasta", name, 1.0, "unit")
+
+
+_SEEDS = {
+    "cake_tortilla_snails": _seed_cake_tortilla_snails,
+    "pasta_planned_then_removed": _seed_pasta_planned_then_removed,
+    "pasta_planned_with_pantry": _seed_pasta_planned_with_pantry,
+    "soup_cake_snails_planned": _seed_soup_cake_snails_planned,
+    "pasta_all_available": _seed_pasta_all_available,
+    "salad_half_available": _seed_salad_half_available,
+    "omelette_egg_expired": _seed_omelette_egg_expired,
+    "complex_pasta_partial": _seed_complex_pasta_partial,
+}
+_SEED_APPS = {}
+
+
+def seeded(key):
+    """Return the app built by _SEEDS[key], building it on first use."""
+    app = _SEED_APPS.get(key)
+    if app is None:
+        from main import FridgeSavvyApp
+        app = FridgeSavvyApp()
+        _SEEDS[key](app)
+        _SEED_APPS[key] = app
+    return app
+
+
+class CoreFridgeTestsMixin:
+    """
+    Regression tests shared by the later iteration suites.
+    Holds the run_cmds harness plus the pantry, recipe and ingredient
+    tests from Iterations 1-3; mix into a unittest.TestCase to run them.
+    """
+
+    # Help is the one large output checked here; the other outputs are
+    # single lines where a plain assertIn is already the cheapest check
+    _PAT_HELP = re.compile(r"Available commands")
+
+    # One app is shared by all suites and one date lookup by the class
+    @classmethod
+    def setUpClass(cls):
+        cls.app = _shared_app()
+        cls.TODAY = date.today()
+        cls.FUTURE_5 = cls.TODAY + timedelta(days=5)
+
+    # Utility: run any iterable of commands and capture output
+    def run_cmds(self, commands):
+        return _run_cmds(self.app, commands, _sink())
+
+    # --------------------------
+    # FROM ITERATIONS 1-3
+    # --------------------------
+
+    def test_A1_add_valid_item(self):
+        out, app = self.run_cmds(CMDS_ADD_MILK)
+        self.assertIn("Added item 'Milk'", out)
+        self.assertEqual(len(app.pantry), 1)
+
+    def test_A3_remove_existing(self):
+        out, app = self.run_cmds(CMDS_ADD_REMOVE_MILK)
+        self.assertIn("Removed item 'Milk'", out)
+        self.assertEqual(len(app.pantry), 0)
+
+    def test_A4_remove_missing(self):
+        out, _ = self.run_cmds(["remove Unknown"])
+        self.assertIn("No pantry item named", out)
+
+    def test_H2_help(self):
+        out, _ = self.run_cmds(["help"])
+        self.assertRegex(out, self._PAT_HELP)
+
+    def test_H4_exit(self):
+        with redirect_stdout(_NULL):
+            result = self.app.handle_command("exit")
+        self.assertFalse(result)
+
+    def test_B1_create_recipe(self):
+        out, app = self.run_cmds(["create recipe Pasta"])
+        self.assertIn("Created empty recipe 'Pasta'", out)
+        self.assertIn("Pasta", app.recipes)
+
+    def test_B2_create_recipe_twice(self):
+        out, _ = self.run_cmds(["create recipe Pasta", "create recipe Pasta"])
+        self.assertIn("already exists", out)
+
+    def test_B3_remove_recipe(self):
+        out, app = self.run_cmds([
+            "create recipe Pasta",
+            "remove recipe Pasta"
+        ])
+        self.assertNotIn("Pasta", app.recipes)
+        self.assertIn("Removed recipe 'Pasta'", out)
+
+    def test_B4_remove_missing_recipe(self):
+        out, _ = self.run_cmds(["remove recipe NOPE"])
+        self.assertIn("No recipe named", out)
+
+    def test_C1_add_ingredient_ok(self):
+        out, app = self.run_cmds(CMDS_ADD_INGREDIENT)
+        self.assertIn("Added ingredient 'Tomato'", out)
+        self.assertIn("Tomato", app.recipes["Salad"])
+
+    def test_C2_add_ingredient_missing_recipe(self):
+        out, _ = self.run_cmds(["add ingredient Missing Tomato 100 g"])
+        self.assertIn("does not exist", out)
+
+    def test_C3_remove_existing_ingredient(self):
+        out, app = self.run_cmds(CMDS_ADD_REMOVE_INGREDIENT)
+        self.assertIn("Removed ingredient", out)
+        self.assertNotIn("Tomato", app.recipes["Salad"])
+
+    def test_C4_remove_missing_ingredient(self):
+        out, _ = self.run_cmds([
+            "create recipe Salad",
+            "remove ingredient Salad Tomato"
+        ])
+        self.assertIn("has no ingredient", out)
+
+
+class PlanningTestsMixin(CoreFridgeTestsMixin):
+    """Adds the Iteration 4 planning and listing tests."""
+
+    # --------------------------
+    # FROM ITERATION 4
+    # GROUP D — Planning
+    # --------------------------
+
+    def test_D1_plan_ok(self):
+        out, app = self.run_cmds(CMDS_PLAN_SOUP)
+        self.assertIn("Planned recipe", out)
+        self.assertEqual(len(app.meal_plan), 1)
+
+    def test_D2_plan_missing_recipe(self):
+        out, _ = self.run_cmds(["plan Missing 2025-10-10"])
+        self.assertIn("does not exist", out)
+
+    def test_D3_unplan_ok(self):
+        out, app = self.run_cmds(CMDS_PLAN_UNPLAN_SOUP)
+        self.assertIn("Removed planned recipe", out)
+        self.assertEqual(len(app.meal_plan), 0)
+
+    def test_D4_unplan_missing(self):
+        out, _ = self.run_cmds([
+            "create recipe Soup",
+            "unplan Soup 2025-10-10"
+        ])
+        self.assertIn("No planned recipe", out)
+
+    # --------------------------
+    # GROUP E — List Commands
+    # --------------------------
+
+    def test_E1_list_pantry_empty(self):
+        out, _ = self.run_cmds(["list pantry"])
+        self.assertIn("Pantry is empty", out)
+
+    def test_E3_list_recipe_empty(self):
+        out, _ = self.run_cmds([
+            "create recipe Empty",
+            "list recipe Empty"
+        ])
+        self.assertIn("has no ingredients", out)
+
+    def test_E4_list_recipe_missing(self):
+        out, _ = self.run_cmds(["list recipe Nope"])
+        self.assertIn("No recipe named", out)
+
+    def test_E5_list_expiring_none(self):
+        out, _ = self.run_cmds(["list expiring"])
+        self.assertIn("No items expiring", out)
+
+
+class SuggestionTestsMixin(PlanningTestsMixin):
+    """Adds the Iteration 5 suggestion and shopping list tests."""
+
+    # --------------------------
+    # FROM ITERATION 5
+    # GROUP F — Suggest recipes
+    # --------------------------
+
+    def test_F1_no_recipes(self):
+        out, _ = self.run_cmds(["suggest recipes"])
+        self.assertIn("No recipes available", out)
+
+    def test_F3_recipe_suggested(self):
+        out, _ = self.run_cmds([
+            "add Tomato Veg %s" % self.FUTURE_5,
+            "create recipe Pasta",
+            "add ingredient Pasta Tomato 1 g",
+            "suggest recipes"
+        ])
+        self.assertIn("Pasta", out)
+
+    def test_F4_recipe_not_suggested_missing_ing(self):
+        out, _ = self.run_cmds(CMDS_SUGGEST_WITHOUT_PANTRY)
+        self.assertIn("Pantry is empty or all items are expired. No recipe suggestions.", out)
+
+    # --------------------------
+    # GROUP G — Generate list
+    # --------------------------
+
+    def test_G1_no_plans(self):
+        out, _ = self.run_cmds(["generate list"])
+        self.assertIn("Shopping list is empty.", out)
+
+    def test_G2_no_recipes_defined(self):
+        out, _ = self.run_cmds([
+            "plan Soup 2025-10-10"
+        ])
+        self.assertIn("Recipe 'Soup' does not exist", out)
+
+    def test_G4_missing_ingredient(self):
+        out, _ = self.run_cmds([
+            "create recipe Pasta",
+            "add ingredient Pasta Tomato 2 g",
+            "plan Pasta 2025-10-10",
+            "generate list"
+        ])
+        self.assertIn("Tomato", out)
+
+    # --------------------------
+    # GROUP H — Misc (Additional)
+    # --------------------------
+
+    def test_H1_unknown_command(self):
+        out, _ = self.run_cmds(["foobar"])
+        self.assertIn("Unknown command", out)
+
+    def test_A2_add_invalid_date(self):
+        out, _ = self.run_cmds(["add Milk Dairy WRONG"])
+        self.assertIn("Invalid date", out)
@@ -3,10 +3,6 @@ import io
 import sys
 from datetime import date, timedelta
 from main import FridgeSavvyApp
-import subprocess
-from pathlib import Path
-
-MAIN = str(Path(__file__).resolve().parent / "main.py")
 
 class TestFridgeSavvyIteration2(unittest.TestCase):
     """
@@ -1,12 +1,171 @@
 import unittest
-import io
-import sys
+from contextlib import redirect_stdout
+from copy import deepcopy
 from datetime import date, timedelta
-from main import FridgeSavvyApp
-import subprocess
-from pathlib import Path
+from unittest.mock import patch
+from main import CommandError, FridgeSavvyApp
+from tests_common import (
+    _NULL, _capture, _run_cmds, _run_last, _run_main, _shared_app, _sink,
+    seeded,
+)
+
+# (id, commands, error code the last command should leave in last_error_code)
+ERROR_CODE_CASES = (
+    ("usage", ("list pantry pantry",), "usage.list.pantry"),
+    ("usage_subcommand", ("add ingredient R I Q U More",), "usage.add.ingredient"),
+    ("missing_subcommand", ("list",), "missing.list"),
+    ("unknown_subcommand", ("list wrong",), "unknown.list"),
+    ("invalid_date", ("add Milk Dairy WRONG",), "invalid.date"),
+    ("invalid_quantity",
+     ("create recipe Crepes", "add ingredient Crepes Egg Two Unit"),
+     "invalid.quantity"),
+    ("notfound_recipe", ("plan Missing 2025-10-10",), "notfound.recipe"),
+    ("notfound_recipe_before_date", ("plan Missing WRONG",), "notfound.recipe"),
+    ("notfound_recipe_before_quantity", ("add ingredient Missing Egg Two Unit",),
+     "notfound.recipe"),
+    ("unknown_command", ("foobar",), "unknown_command"),
+    ("cleared_on_success", ("add Milk Dairy WRONG", "list pantry"), None),
+)
+
+
+# (id, commands, expected substring) for every test that runs commands on
+# a fresh app and checks a single message; run by test_command_table, which
+# only searches the output of the last command.
+COMMAND_CASES = (
+    # From iterations 1-6
+    ("A4_remove_missing", ("remove Unknown",),
+     "No pantry item named"),
+    ("H2_help", ("help",),
+     "Available commands"),
+    ("B2_create_recipe_twice", ("create recipe Pasta", "create recipe Pasta"),
+     "already exists"),
+    ("B4_remove_missing_recipe", ("remove recipe NOPE",),
+     "No recipe named"),
+    ("C2_add_ingredient_missing_recipe",
+     ("add ingredient Missing Tomato 100 g",),
+     "does not exist"),
+    ("C4_remove_missing_ingredient",
+     ("create recipe Salad", "remove ingredient Salad Tomato"),
+     "has no ingredient"),
+    ("D2_plan_missing_recipe", ("plan Missing 2025-10-10",),
+     "does not exist"),
+    ("D4_unplan_missing", ("create recipe Soup", "unplan Soup 2025-10-10"),
+     "No planned recipe"),
+    ("E1_list_pantry_empty", ("list pantry",),
+     "Pantry is empty"),
+    ("E3_list_recipe_empty", ("create recipe Empty", "list recipe Empty"),
+     "has no ingredients"),
+    ("E4_list_recipe_missing", ("list recipe Nope",),
+     "No recipe named"),
+    ("E5_list_expiring_none", ("list expiring",),
+     "No items expiring"),
+    ("F1_no_recipes", ("suggest recipes",),
+     "No recipes available"),
+    ("F4_recipe_not_suggested_missing_ing",
+     ("create recipe Pasta",
+      "add ingredient Pasta Tomato 1 g",
+      "suggest recipes"),
+     "Pantry is empty or all items are expired. No recipe suggestions."),
+    ("G1_no_plans", ("generate list",),
+     "Shopping list is empty."),
+    ("G2_no_recipes_defined", ("plan Soup 2025-10-10",),
+     "Recipe 'Soup' does not exist"),
+    ("G4_missing_ingredient",
+     ("create recipe Pasta",
+      "add ingredient Pasta Tomato 2 g",
+      "plan Pasta 2025-10-10",
+      "generate list"),
+     "Tomato"),
+    ("H1_unknown_command", ("foobar",),
+     "Unknown command"),
+    ("A2_add_invalid_date", ("add Milk Dairy WRONG",),
+     "Invalid date"),
+    ("I2_add_missing_arguments", ("add",),
+     "Incomplete 'add' command"),
+    ("I2_add_wrong_arguments",
+     ("create recipe Crepes", "add ingredient Crepes Egg Two Unit"),
+     "Expected a number."),
+    ("I2_add_pantry_wrong_arg_count", ("add Milk Dairy",),
+     "Usage: add "),
+    ("I2_add_ingredient_wrong_arg_count", ("",),
+     "Enter a command"),
+    ("I2_add_ingredient_too_many_args", ("add ingredient R I Q U More",),
+     "Usage: add ingredient "),
+    ("I2_remove_no_arguments", ("remove",),
+     "Incomplete 'remove' command"),
+    ("I2_remove_too_many_args", ("remove egg bread",),
+     "Usage: "),
+    ("I2_remove_recipe_missing_name", ("remove recipe",),
+     "Usage: remove recipe"),
+    ("I2_remove_ingredient_missing_name", ("remove ingredient R",),
+     "Usage: remove ingredient"),
+    ("I2_remove_ingredient_wrong_recipe_name", ("remove ingredient R egg",),
+     "No recipe named"),
+    ("I2_create_wrong_usage", ("create",),
+     "Usage: create recipe"),
+    ("I2_create_recipe_missing_name", ("create recipe",),
+     "Usage: create recipe"),
+    ("I2_plan_missing_arguments", ("plan Soup",),
+     "Usage: plan"),
+    ("I2_plan_invalid_date", ("create recipe Soup", "plan Soup abc"),
+     "Invalid date"),
+    ("I2_unplan_missing_arguments", ("unplan Soup",),
+     "Usage: unplan"),
+    ("I2_unplan_invalid_date", ("unplan Soup bad-date",),
+     "Invalid date"),
+
+    # New in iteration 7
+    ("I2_list_invalid_subcommand", ("list wrong",),
+     "Unknown 'list' command"),
+    ("I2_list_recipe_wrong_usage", ("list recipe",),
+     "Usage: list recipe"),
+    ("I2_list_expiring_too_many_args", ("list expiring now",),
+     "Usage: list expiring"),
+    ("I2_list_too_few_args", ("list",),
+     "Usage: list pantry |"),
+    ("I2_list_pantry_too_many_args", ("list pantry pantry",),
+     "Usage: list pantry"),
+    ("I2_list_pantry", ("add Milk Dairy 2025-11-01", "list pantry"),
+     "Milk (Dairy) – Expires 2025-11-01"),
+    ("I2_list_recipe",
+     ("create recipe Soup",
+      "add ingredient Soup tomato 1 unit",
+      "list recipe Soup"),
+     "tomato – 1.0 unit"),
+    ("I2_suggest_wrong_usage_missing_keyword", ("suggest",),
+     "Usage: suggest recipes"),
+    ("I2_suggest_wrong_usage_recipe", ("suggest recipe",),
+     "Usage: suggest recipes"),
+    ("I2_suggest_recipe_empty_ingredient_list",
+     ("create recipe EmptyStar",
+      "add Egg Dairy 2099-01-01",
+      "suggest recipes"),
+     "No recipes can be fully prepared with current pantry items."),
+    ("I2_generate_wrong_usage_missing_keyword", ("generate",),
+     "Usage: generate list"),
+    ("I2_generate_wrong_usage_extra_args", ("generate list extra",),
+     "Usage: generate list"),
+    ("I2_generate_list_no_recipe", ("generate list",),
+     "No recipes defined. Shopping list is empty."),
+    ("I2_remove_when_several_itemsin_the_pantry",
+     ("add Milk Dairy 2025-11-01",
+      "add Bread Bakery 2025-11-11",
+      "add Tomato Vegetables 2025-11-12",
+      "remove Bread"),
+     "Removed item"),
+    ("I2_unplan_boucle",
+     ("create recipe Soup",
+      "create recipe Cake",
+      "create recipe Snails",
+      "plan Soup 2025-11-28",
+      "plan Cake 2025-11-15",
+      "plan Snails 2025-12-01",
+      "unplan Cake 2025-11-15"),
+     "Removed planned recipe"),
+    ("I2_unknown_full_command", ("blablabla",),
+     "Unknown command"),
+)
 
-MAIN = str(Path(__file__).resolve().parent / "main.py")
 
 class TestFridgeSavvyIteration7(unittest.TestCase):
     """
@@ -16,18 +175,28 @@ class TestFridgeSavvyIteration7(unittest.TestCase):
     Includes all tests from Iterations 1-6 plus final edge cases
     """
 
+    # One app is shared by all suites and reset before each run
+    @classmethod
+    def setUpClass(cls):
+        cls.app = _shared_app()
+
     # Utility: run a sequence of commands and capture output
     def run_cmds(self, commands):
-        app = FridgeSavvyApp()
-        buffer = io.StringIO()
-        sys_stdout = sys.stdout
-        sys.stdout = buffer
-        try:
-            for cmd in commands:
-                app.handle_command(cmd)
-        finally:
-            sys.stdout = sys_stdout
-        return buffer.getvalue(), app
+        return _run_cmds(self.app, commands, _sink())
+
+    def test_command_table(self):
+        """Runs every COMMAND_CASES entry as a subtest named by its id."""
+        for case_id, cmds, expected in COMMAND_CASES:
+            with self.subTest(case_id):
+                out = _run_last(self.app, cmds, _sink())
+                self.assertIn(expected, out)
+
+    def test_error_codes(self):
+        """Covers the machine-readable code recorded for each kind of error."""
+        for case_id, cmds, code in ERROR_CODE_CASES:
+            with self.subTest(case_id):
+                _run_last(self.app, cmds, _sink())
+                self.assertEqual(self.app.last_error_code, code)
 
     # --------------------------
     # FROM ITERATIONS 1-6
@@ -46,23 +215,9 @@ class TestFridgeSavvyIteration7(unittest.TestCase):
         self.assertIn("Removed item 'Milk'", out)
         self.assertEqual(len(app.pantry), 0)
 
-    def test_A4_remove_missing(self):
-        out, _ = self.run_cmds(["remove Unknown"])
-        self.assertIn("No pantry item named", out)
-
-    def test_H2_help(self):
-        out, _ = self.run_cmds(["help"])
-        self.assertIn("Available commands", out)
-
     def test_H4_exit(self):
-        app = FridgeSavvyApp()
-        buffer = io.StringIO()
-        sys_stdout = sys.stdout
-        sys.stdout = buffer
-        try:
-            result = app.handle_command("exit")
-        finally:
-            sys.stdout = sys_stdout
+        with redirect_stdout(_NULL):
+            result = self.app.handle_command("exit")
         self.assertFalse(result)
 
     def test_B1_create_recipe(self):
@@ -70,10 +225,6 @@ class TestFridgeSavvyIteration7(unittest.TestCase):
         self.assertIn("Created empty recipe 'Pasta'", out)
         self.assertIn("Pasta", app.recipes)
 
-    def test_B2_create_recipe_twice(self):
-        out, _ = self.run_cmds(["create recipe Pasta", "create recipe Pasta"])
-        self.assertIn("already exists", out)
-
     def test_B3_remove_recipe(self):
         out, app = self.run_cmds([
             "create recipe Pasta",
@@ -82,10 +233,6 @@ class TestFridgeSavvyIteration7(unittest.TestCase):
         self.assertNotIn("Pasta", app.recipes)
         self.assertIn("Removed recipe 'Pasta'", out)
 
-    def test_B4_remove_missing_recipe(self):
-        out, _ = self.run_cmds(["remove recipe NOPE"])
-        self.assertIn("No recipe named", out)
-
     def test_C1_add_ingredient_ok(self):
         out, app = self.run_cmds([
             "create recipe Salad",
@@ -94,10 +241,6 @@ class TestFridgeSavvyIteration7(unittest.TestCase):
         self.assertIn("Added ingredient 'Tomato'", out)
         self.assertIn("Tomato", app.recipes["Salad"])
 
-    def test_C2_add_ingredient_missing_recipe(self):
-        out, _ = self.run_cmds(["add ingredient Missing Tomato 100 g"])
-        self.assertIn("does not exist", out)
-
     def test_C3_remove_existing_ingredient(self):
         out, app = self.run_cmds([
             "create recipe Salad",
@@ -107,13 +250,6 @@ class TestFridgeSavvyIteration7(unittest.TestCase):
         self.assertIn("Removed ingredient", out)
         self.assertNotIn("Tomato", app.recipes["Salad"])
 
-    def test_C4_remove_missing_ingredient(self):
-        out, _ = self.run_cmds([
-            "create recipe Salad",
-            "remove ingredient Salad Tomato"
-        ])
-        self.assertIn("has no ingredient", out)
-
     def test_D1_plan_ok(self):
         out, app = self.run_cmds([
             "create recipe Soup",
@@ -122,10 +258,6 @@ class TestFridgeSavvyIteration7(unittest.TestCase):
         self.assertIn("Planned recipe", out)
         self.assertEqual(len(app.meal_plan), 1)
 
-    def test_D2_plan_missing_recipe(self):
-        out, _ = self.run_cmds(["plan Missing 2025-10-10"])
-        self.assertIn("does not exist", out)
-
     def test_D3_unplan_ok(self):
         out, app = self.run_cmds([
             "create recipe Soup",
@@ -135,36 +267,6 @@ class TestFridgeSavvyIteration7(unittest.TestCase):
         self.assertIn("Removed planned recipe", out)
         self.assertEqual(len(app.meal_plan), 0)
 
-    def test_D4_unplan_missing(self):
-        out, _ = self.run_cmds([
-            "create recipe Soup",
-            "unplan Soup 2025-10-10"
-        ])
-        self.assertIn("No planned recipe", out)
-
-    def test_E1_list_pantry_empty(self):
-        out, _ = self.run_cmds(["list pantry"])
-        self.assertIn("Pantry is empty", out)
-
-    def test_E3_list_recipe_empty(self):
-        out, _ = self.run_cmds([
-            "create recipe Empty",
-            "list recipe Empty"
-        ])
-        self.assertIn("has no ingredients", out)
-
-    def test_E4_list_recipe_missing(self):
-        out, _ = self.run_cmds(["list recipe Nope"])
-        self.assertIn("No recipe named", out)
-
-    def test_E5_list_expiring_none(self):
-        out, _ = self.run_cmds(["list expiring"])
-        self.assertIn("No items expiring", out)
-
-    def test_F1_no_recipes(self):
-        out, _ = self.run_cmds(["suggest recipes"])
-        self.assertIn("No recipes available", out)
-
     def test_F3_recipe_suggested(self):
         today = date.today()
         future = today + timedelta(days=5)
@@ -176,280 +278,114 @@ class TestFridgeSavvyIteration7(unittest.TestCase):
         ])
         self.assertIn("Pasta", out)
 
-    def test_F4_recipe_not_suggested_missing_ing(self):
-        out, _ = self.run_cmds([
-            "create recipe Pasta",
-            "add ingredient Pasta Tomato 1 g",
-            "suggest recipes"
-        ])
-        self.assertIn("Pantry is empty or all items are expired. No recipe suggestions.", out)
-
-    def test_G1_no_plans(self):
-        out, _ = self.run_cmds(["generate list"])
-        self.assertIn("Shopping list is empty.", out)
-
-    def test_G2_no_recipes_defined(self):
-        out, _ = self.run_cmds([
-            "plan Soup 2025-10-10"
-        ])
-        self.assertIn("Recipe 'Soup' does not exist", out)
-
-    def test_G4_missing_ingredient(self):
-        out, _ = self.run_cmds([
-            "create recipe Pasta",
-            "add ingredient Pasta Tomato 2 g",
-            "plan Pasta 2025-10-10",
-            "generate list"
-        ])
-        self.assertIn("Tomato", out)
-
-    def test_H1_unknown_command(self):
-        out, _ = self.run_cmds(["foobar"])
-        self.assertIn("Unknown command", out)
-
-    def test_A2_add_invalid_date(self):
-        out, _ = self.run_cmds(["add Milk Dairy WRONG"])
-        self.assertIn("Invalid date", out)
-
-    def test_I2_add_missing_arguments(self):
-        out, _ = self.run_cmds(["add"])
-        self.assertIn("Incomplete 'add' command", out)
-
-    def test_I2_add_wrong_arguments(self):
-        out, _ = self.run_cmds([
-            "create recipe Crepes",
-            "add ingredient Crepes Egg Two Unit"
-        ])
-        self.assertIn("Expected a number.", out)
-
-    def test_I2_add_pantry_wrong_arg_count(self):
-        out, _ = self.run_cmds(["add Milk Dairy"])
-        self.assertIn("Usage: add ", out)
-
-    def test_I2_add_ingredient_wrong_arg_count(self):
-        out, _ = self.run_cmds([""])
-        self.assertIn("Enter a command", out)
-
-    def test_I2_add_ingredient_too_many_args(self):
-        out, _ = self.run_cmds(["add ingredient R I Q U More"])
-        self.assertIn("Usage: add ingredient ", out)
-
-    def test_I2_remove_no_arguments(self):
-        out, _ = self.run_cmds(["remove"])
-        self.assertIn("Incomplete 'remove' command", out)
-
-    def test_I2_remove_too_many_args(self):
-        out, _ = self.run_cmds(["remove egg bread"])
-        self.assertIn("Usage: ", out)
-
-    def test_I2_remove_recipe_missing_name(self):
-        out, _ = self.run_cmds(["remove recipe"])
-        self.assertIn("Usage: remove recipe", out)
-
-    def test_I2_remove_ingredient_missing_name(self):
-        out, _ = self.run_cmds(["remove ingredient R"])
-        self.assertIn("Usage: remove ingredient", out)
-
-    def test_I2_remove_ingredient_wrong_recipe_name(self):
-        out, _ = self.run_cmds(["remove ingredient R egg"])
-        self.assertIn("No recipe named", out)
-
-    def test_I2_create_wrong_usage(self):
-        out, _ = self.run_cmds(["create"])
-        self.assertIn("Usage: create recipe", out)
-
-    def test_I2_create_recipe_missing_name(self):
-        out, _ = self.run_cmds(["create recipe"])
-        self.assertIn("Usage: create recipe", out)
-
-    def test_I2_plan_missing_arguments(self):
-        out, _ = self.run_cmds(["plan Soup"])
-        self.assertIn("Usage: plan", out)
-
-    def test_I2_plan_invalid_date(self):
-        out, _ = self.run_cmds([
-            "create recipe Soup",
-            "plan Soup abc"
-        ])
-        self.assertIn("Invalid date", out)
-
-    def test_I2_unplan_missing_arguments(self):
-        out, _ = self.run_cmds(["unplan Soup"])
-        self.assertIn("Usage: unplan", out)
-
-    def test_I2_unplan_invalid_date(self):
-        out, _ = self.run_cmds(["unplan Soup bad-date"])
-        self.assertIn("Invalid date", out)
-
     # --------------------------
     # NEW IN ITERATION 7
     # Final Edge Cases & Loops
     # --------------------------
 
-    def test_I2_list_invalid_subcommand(self):
-        """Covers list invalid type."""
-        out, _ = self.run_cmds(["list wrong"])
-        self.assertIn("Unknown 'list' command", out)
-
-    def test_I2_list_recipe_wrong_usage(self):
-        """Covers list recipe wrong usage."""
-        out, _ = self.run_cmds(["list recipe"])
-        self.assertIn("Usage: list recipe", out)
-
-    def test_I2_list_expiring_too_many_args(self):
-        """Covers 'list expiring' with extra args."""
-        out, _ = self.run_cmds(["list expiring now"])
-        self.assertIn("Usage: list expiring", out)
-
-    def test_I2_list_too_few_args(self):
-        """Covers list with no subcommand."""
-        out, _ = self.run_cmds(["list"])
-        self.assertIn("Usage: list pantry |", out)
-
-    def test_I2_list_pantry_too_many_args(self):
-        """Covers list pantry with extra args."""
-        out, _ = self.run_cmds(["list pantry pantry"])
-        self.assertIn("Usage: list pantry", out)
-
-    def test_I2_list_pantry(self):
-        """Covers list pantry with items."""
-        out, _ = self.run_cmds([
-            "add Milk Dairy 2025-11-01",
-            "list pantry"
-        ])
-        self.assertIn("Milk (Dairy) – Expires 2025-11-01", out)
-
-    def test_I2_list_recipe(self):
-        """Covers list recipe with ingredients."""
-        out, _ = self.run_cmds([
-            "create recipe Soup",
-            "add ingredient Soup tomato 1 unit",
-            "list recipe Soup"
-        ])
-        self.assertIn("tomato – 1.0 unit", out)
-
     def test_I2_list_expiring(self):
         """Covers list expiring with items."""
-        date = FridgeSavvyApp()._today()
-        out, _ = self.run_cmds([
-            f"add Milk Dairy {date}",
-            "list expiring"
-        ])
-        self.assertIn("Milk (Dairy) – Expires", out)
-
-    def test_I2_suggest_wrong_usage_missing_keyword(self):
-        """Covers suggest alone."""
-        out, _ = self.run_cmds(["suggest"])
-        self.assertIn("Usage: suggest recipes", out)
-
-    def test_I2_suggest_wrong_usage_recipe(self):
-        """Covers suggest recipe wrong usage."""
-        out, _ = self.run_cmds(["suggest recipe"])
-        self.assertIn("Usage: suggest recipes", out)
-
-    def test_I2_suggest_recipe_empty_ingredient_list(self):
-        """Covers recipe with no ingredients should not be suggested."""
-        out, _ = self.run_cmds([
-            "create recipe EmptyStar",
-            "add Egg Dairy 2099-01-01",
-            "suggest recipes"
-        ])
-        self.assertIn("No recipes can be fully prepared with current pantry items.", out)
+        with patch.object(FridgeSavvyApp, "_today", return_value=date(2025, 10, 1)):
+            out, _ = self.run_cmds([
+                "add Milk Dairy 2025-10-01",
+                "list expiring"
+            ])
+        self.assertIn("Milk (Dairy) – Expires 2025-10-01", out)
+
+    def test_I2_parse_date_cached(self):
+        """Covers the memoized date parser: valid dates are reused, invalid ones always raise."""
+        parse = FridgeSavvyApp._parse_date
+        self.assertIs(parse("2025-10-10"), parse("2025-10-10"))
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                parse("2025-13-01")
 
     def test_I2_suggest_recipe_loop(self):
         """Covers multiple recipe suggestions."""
-        out, _ = self.run_cmds([
-            "create recipe Tortilla",
-            "create recipe Cake",
-            "create recipe Snails",
-            "add ingredient Cake Egg 3 unit",
-            "add ingredient Tortilla Potatoes 4 kg",
-            "add ingredient Tortilla Egg 4 unit",
-            "add Egg Dairy 2099-01-01",
-            "suggest recipes"
-        ])
+        app = deepcopy(seeded("cake_tortilla_snails"))
+        out = _capture(app, ["suggest recipes"], _sink())
         self.assertIn("You can prepare the following recipes with your current pantry:\n- Cake", out)
 
-    def test_I2_generate_wrong_usage_missing_keyword(self):
-        """Covers 'generate' alone."""
-        out, _ = self.run_cmds(["generate"])
-        self.assertIn("Usage: generate list", out)
-
-    def test_I2_generate_wrong_usage_extra_args(self):
-        """Covers 'generate list' extra tokens."""
-        out, _ = self.run_cmds(["generate list extra"])
-        self.assertIn("Usage: generate list", out)
-
     def test_I2_generate_list_meal_plan_but_recipe_missing(self):
         """Covers planned recipe removed before generating list."""
-        out, app = self.run_cmds([
-            "create recipe Pasta",
-            "create recipe Soup",
-            "add ingredient Pasta Tomato 2 g",
-            "plan Pasta 2025-10-10",
-            "remove recipe Pasta",
-            "generate list"
-        ])
+        app = deepcopy(seeded("pasta_planned_then_removed"))
+        out = _capture(app, ["generate list"], _sink())
         self.assertIn("No meals planned. Shopping list is empty.", out)
 
-    def test_I2_generate_list_no_recipe(self):
-        """Covers generating list but without any recipe."""
-        out, app = self.run_cmds([
-            "generate list"
-        ])
-        self.assertIn("No recipes defined. Shopping list is empty.", out)
-
     def test_I2_no_missing_ingredient(self):
         """Covers all ingredients available."""
-        out, _ = self.run_cmds([
+        app = deepcopy(seeded("pasta_planned_with_pantry"))
+        out = _capture(app, ["generate list"], _sink())
+        self.assertIn("Tomato", out)
+
+    def test_I2_seeded_copy_is_independent(self):
+        """Covers deep-copying an app: the copy's commands leave the seed unchanged."""
+        app = deepcopy(seeded("pasta_planned_with_pantry"))
+        out = _capture(app, ["remove recipe Pasta", "generate list"], _sink())
+        self.assertIn("Also removed 1 planned occurrence(s).", out)
+        seed = seeded("pasta_planned_with_pantry")
+        self.assertIn("Pasta", seed.recipes)
+        self.assertEqual(len(seed.meal_plan), 1)
+
+    def test_I2_typed_api_matches_commands(self):
+        """Covers the typed API: it builds the same state as the commands."""
+        _, app = self.run_cmds([
             "create recipe Pasta",
             "add ingredient Pasta Tomato 2 g",
             "add ingredient Pasta Butter 50 g",
             "add Butter Dairy 2025-12-01",
             "add Tomato Vegetable 2025-12-03",
             "plan Pasta 2025-10-10",
-            "generate list"
-        ])
-        self.assertIn("Tomato", out)
-
-    def test_I2_remove_when_several_itemsin_the_pantry(self):
-        """Covers loop in remove when multiple items."""
-        out, _ = self.run_cmds([
-            "add Milk Dairy 2025-11-01",
-            "add Bread Bakery 2025-11-11",
-            "add Tomato Vegetables 2025-11-12",
-            "remove Bread"
         ])
-        self.assertIn("Removed item", out)
-
-    def test_I2_unplan_boucle(self):
-        """Covers loop in unplan."""
-        out, _ = self.run_cmds([
-            "create recipe Soup",
-            "create recipe Cake",
-            "create recipe Snails",
-            "plan Soup 2025-11-28",
-            "plan Cake 2025-11-15",
-            "plan Snails 2025-12-01",
-            "unplan Cake 2025-11-15"
-        ])
-        self.assertIn("Removed planned recipe", out)
-
-    def test_I2_unknown_full_command(self):
-        """Covers default case in handle_command for unknown commands."""
-        out, _ = self.run_cmds(["blablabla"])
-        self.assertIn("Unknown command", out)
+        seed = seeded("pasta_planned_with_pantry")
+        self.assertEqual(seed.pantry, app.pantry)
+        self.assertEqual(seed.recipes, app.recipes)
+        self.assertEqual(seed.meal_plan, app.meal_plan)
+
+    def test_I2_typed_api_missing_recipe(self):
+        """Covers the typed API: a missing recipe raises like the commands report."""
+        app = self.app
+        app.reset()
+        with self.assertRaises(CommandError) as cm:
+            app.add_ingredient("Missing", "Tomato", 1.0, "g")
+        self.assertEqual(cm.exception.code, "notfound.recipe")
+        self.assertEqual(str(cm.exception),
+                         "Recipe 'Missing' does not exist. Create it first.")
+        with self.assertRaises(CommandError) as cm:
+            app.plan_recipe("Missing", date(2025, 10, 10))
+        self.assertEqual(cm.exception.code, "notfound.recipe")
+        self.assertEqual(str(cm.exception), "Recipe 'Missing' does not exist.")
+        with self.assertRaises(CommandError) as cm:
+            app.remove_ingredient("Missing", "Tomato")
+        self.assertEqual(cm.exception.code, "notfound.recipe")
+        self.assertEqual((app.recipes, app.meal_plan), ({}, {}))
+
+    def test_I2_typed_api_removals(self):
+        """Covers the typed API: removals report whether anything was removed."""
+        app = deepcopy(seeded("pasta_planned_with_pantry"))
+        self.assertTrue(app.remove_item("Butter"))
+        self.assertFalse(app.remove_item("Butter"))
+        self.assertTrue(app.remove_ingredient("Pasta", "Butter"))
+        self.assertFalse(app.remove_ingredient("Pasta", "Butter"))
+        self.assertTrue(app.unplan_recipe("Pasta", date(2025, 10, 10)))
+        self.assertFalse(app.unplan_recipe("Pasta", date(2025, 10, 10)))
+        self.assertEqual([item.name for item in app.pantry], ["Tomato"])
+        self.assertEqual(list(app.recipes["Pasta"]), ["Tomato"])
+        self.assertEqual(app.meal_plan, {})
+
+    def test_I2_handle_commands_stops_at_exit(self):
+        """Covers batch handling: lines after 'exit' are not run."""
+        app = self.app
+        app.reset()
+        with redirect_stdout(_NULL):
+            finished = app.handle_commands(["create recipe Soup", "exit", "create recipe Cake"])
+        self.assertFalse(finished)
+        self.assertIn("Soup", app.recipes)
+        self.assertNotIn("Cake", app.recipes)
 
     def test_startup_banner(self):
-        """Tests that running main.py prints the startup banner."""
-        proc = subprocess.Popen(
-            [sys.executable, MAIN],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        out, err = proc.communicate("exit\n")
+        """Tests that main() prints the startup banner."""
+        out = _run_main("exit\n", _sink())
         self.assertIn("FridgeSavvy – Smart kitchen inventory", out)
         self.assertIn("Type 'help' to see available commands.", out)
 
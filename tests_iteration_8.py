@@ -1,68 +1,184 @@
 import unittest
-import io
-import sys
+import os
+import time
+from contextlib import redirect_stdout
+from copy import deepcopy
 from datetime import date, timedelta
+from unittest.mock import patch
 from main import FridgeSavvyApp
-import subprocess
-from pathlib import Path
+from tests_common import (
+    CMDS_ADD_INGREDIENT, CMDS_ADD_MILK, CMDS_ADD_REMOVE_INGREDIENT,
+    CMDS_ADD_REMOVE_MILK, CMDS_PLAN_SOUP, CMDS_PLAN_UNPLAN_SOUP,
+    CMDS_SUGGEST_WITHOUT_PANTRY, _NULL, _capture, _run_cmds, _run_main,
+    _run_main_interactive, _run_quiet, _shared_app, _sink, seeded,
+)
+
+# Dates are computed once at import; no test depends on the date changing
+# during a run
+TODAY = date.today()
+FUTURE_5 = TODAY + timedelta(days=5)
+CMDS_SUGGEST_WITH_PANTRY = (
+    "add Tomato Veg %s" % FUTURE_5,
+) + CMDS_SUGGEST_WITHOUT_PANTRY
+
+# Well-formed commands that all take handle_command's precompiled fast path;
+# repeated by the dispatch throughput test
+CMDS_DISPATCH = (
+    "add Milk Dairy 2025-11-01",
+    "create recipe Soup",
+    "add ingredient Soup Tomato 2 unit",
+    "plan Soup 2025-11-02",
+    "list pantry",
+    "list recipe Soup",
+    "unplan Soup 2025-11-02",
+    "remove Milk",
+)
+
+# (id, commands, expected substring) for every test that runs commands on
+# a fresh app and checks a single message; run by test_command_table
+COMMAND_CASES = (
+    ("A4_remove_missing", ("remove Unknown",), "No pantry item named"),
+    ("H2_help", ("help",), "Available commands"),
+    ("B4_remove_missing_recipe", ("remove recipe NOPE",), "No recipe named"),
+    ("C2_add_ingredient_missing_recipe",
+     ("add ingredient Missing Tomato 100 g",),
+     "does not exist"),
+    ("D2_plan_missing_recipe", ("plan Missing 2025-10-10",), "does not exist"),
+    ("E1_list_pantry_empty", ("list pantry",), "Pantry is empty"),
+    ("E4_list_recipe_missing", ("list recipe Nope",), "No recipe named"),
+    ("E5_list_expiring_none", ("list expiring",), "No items expiring"),
+    ("F1_no_recipes", ("suggest recipes",), "No recipes available"),
+    ("H1_unknown_command", ("foobar",), "Unknown command"),
+    ("A2_add_invalid_date", ("add Milk Dairy WRONG",), "Invalid date"),
+    ("I2_add_missing_arguments", ("add",), "Incomplete 'add' command"),
+    ("I2_add_pantry_wrong_arg_count", ("add Milk Dairy",), "Usage: add "),
+    ("I2_add_ingredient_wrong_arg_count", ("",), "Enter a command"),
+    ("I2_add_ingredient_too_many_args", ("add ingredient R I Q U More",),
+     "Usage: add ingredient "),
+    ("I2_remove_no_arguments", ("remove",), "Incomplete 'remove' command"),
+    ("I2_remove_too_many_args", ("remove egg bread",), "Usage: "),
+    ("I2_remove_recipe_missing_name", ("remove recipe",),
+     "Usage: remove recipe"),
+    ("I2_remove_ingredient_missing_name", ("remove ingredient R",),
+     "Usage: remove ingredient"),
+    ("I2_remove_ingredient_wrong_recipe_name", ("remove ingredient R egg",),
+     "No recipe named"),
+    ("I2_create_wrong_usage", ("create",), "Usage: create recipe"),
+    ("I2_create_recipe_missing_name", ("create recipe",),
+     "Usage: create recipe"),
+    ("I2_plan_missing_arguments", ("plan Soup",), "Usage: plan"),
+    ("I2_unplan_missing_arguments", ("unplan Soup",), "Usage: unplan"),
+    ("I2_unplan_invalid_date", ("unplan Soup bad-date",), "Invalid date"),
+    ("I2_list_invalid_subcommand", ("list wrong",), "Unknown 'list' command"),
+    ("I2_list_recipe_wrong_usage", ("list recipe",), "Usage: list recipe"),
+    ("I2_list_expiring_too_many_args", ("list expiring now",),
+     "Usage: list expiring"),
+    ("I2_list_too_few_args", ("list",), "Usage: list pantry |"),
+    ("I2_list_pantry_too_many_args", ("list pantry pantry",),
+     "Usage: list pantry"),
+    ("I2_suggest_wrong_usage_missing_keyword", ("suggest",),
+     "Usage: suggest recipes"),
+    ("I2_suggest_wrong_usage_recipe", ("suggest recipe",),
+     "Usage: suggest recipes"),
+    ("I2_generate_wrong_usage_missing_keyword", ("generate",),
+     "Usage: generate list"),
+    ("I2_generate_wrong_usage_extra_args", ("generate list extra",),
+     "Usage: generate list"),
+    ("I2_generate_list_no_recipe", ("generate list",),
+     "No recipes defined. Shopping list is empty."),
+    ("B2_create_recipe_twice", ("create recipe Pasta", "create recipe Pasta"),
+     "already exists"),
+    ("F3_recipe_suggested", CMDS_SUGGEST_WITH_PANTRY, "Pasta"),
+    ("F4_recipe_not_suggested_missing_ing", CMDS_SUGGEST_WITHOUT_PANTRY,
+     "Pantry is empty or all items are expired. No recipe suggestions."),
+    ("C4_remove_missing_ingredient",
+     ("create recipe Salad", "remove ingredient Salad Tomato"),
+     "has no ingredient"),
+    ("D4_unplan_missing",
+     ("create recipe Soup", "unplan Soup 2025-10-10"),
+     "No planned recipe"),
+    ("E3_list_recipe_empty",
+     ("create recipe Empty", "list recipe Empty"),
+     "has no ingredients"),
+    ("G2_no_recipes_defined", ("plan Soup 2025-10-10",),
+     "Recipe 'Soup' does not exist"),
+    ("G4_missing_ingredient",
+     ("create recipe Pasta",
+      "add ingredient Pasta Tomato 2 g",
+      "plan Pasta 2025-10-10",
+      "generate list"),
+     "Tomato"),
+    ("I2_add_wrong_arguments",
+     ("create recipe Crepes", "add ingredient Crepes Egg Two Unit"),
+     "Expected a number."),
+    ("I2_plan_invalid_date",
+     ("create recipe Soup", "plan Soup abc"),
+     "Invalid date"),
+    ("I2_list_pantry",
+     ("add Milk Dairy 2025-11-01", "list pantry"),
+     "Milk (Dairy) – Expires 2025-11-01"),
+    ("I2_list_recipe",
+     ("create recipe Soup",
+      "add ingredient Soup tomato 1 unit",
+      "list recipe Soup"),
+     "tomato – 1.0 unit"),
+    ("I2_suggest_recipe_empty_ingredient_list",
+     ("create recipe EmptyStar",
+      "add Egg Dairy 2099-01-01",
+      "suggest recipes"),
+     "No recipes can be fully prepared with current pantry items."),
+    ("I2_remove_when_several_itemsin_the_pantry",
+     ("add Milk Dairy 2025-11-01",
+      "add Bread Bakery 2025-11-11",
+      "add Tomato Vegetables 2025-11-12",
+      "remove Bread"),
+     "Removed item"),
+)
 
-MAIN = str(Path(__file__).resolve().parent / "main.py")
 
 class TestFridgeSavvyIteration8(unittest.TestCase):
     """
     ITERATION 8: Final Push for 100% Coverage
-    Expected Coverage: ~97-100% branch coverage
-    Includes all 66 tests from Iteration 7 + 7 new targeted tests
-    Target: Lines 653, 704-718, 722 (main function and edge cases)
+    Single-message checks from the earlier iterations run as rows of
+    COMMAND_CASES; the remaining tests cover state changes, suggestions
+    and shopping lists across pantry, recipe and plan edits, main() in
+    batch and interactive mode, and the command dispatch pattern.
     """
 
+    # One app is shared by all suites and reset before each run
+    @classmethod
+    def setUpClass(cls):
+        cls.app = _shared_app()
+
     # Utility: run a sequence of commands and capture output
     def run_cmds(self, commands):
-        app = FridgeSavvyApp()
-        buffer = io.StringIO()
-        sys_stdout = sys.stdout
-        sys.stdout = buffer
-        try:
-            for cmd in commands:
-                app.handle_command(cmd)
-        finally:
-            sys.stdout = sys_stdout
-        return buffer.getvalue(), app
+        return _run_cmds(self.app, commands, _sink())
 
     # --------------------------
     # ALL TESTS FROM ITERATION 7
     # --------------------------
 
+    def test_command_table(self):
+        """Runs every COMMAND_CASES entry as a subtest named by its id."""
+        for case_id, commands, expected in COMMAND_CASES:
+            with self.subTest(case_id):
+                out, _ = self.run_cmds(commands)
+                self.assertIn(expected, out)
+
     def test_A1_add_valid_item(self):
-        out, app = self.run_cmds(["add Milk Dairy 2025-11-01"])
+        out, app = self.run_cmds(CMDS_ADD_MILK)
         self.assertIn("Added item 'Milk'", out)
         self.assertEqual(len(app.pantry), 1)
 
     def test_A3_remove_existing(self):
-        out, app = self.run_cmds([
-            "add Milk Dairy 2025-11-01",
-            "remove Milk"
-        ])
-        self.assertIn("Removed item 'Milk'", out)
+        # The removal message is checked by the
+        # I2_remove_when_several_itemsin_the_pantry case
+        app = _run_quiet(self.app, CMDS_ADD_REMOVE_MILK)
         self.assertEqual(len(app.pantry), 0)
 
-    def test_A4_remove_missing(self):
-        out, _ = self.run_cmds(["remove Unknown"])
-        self.assertIn("No pantry item named", out)
-
-    def test_H2_help(self):
-        out, _ = self.run_cmds(["help"])
-        self.assertIn("Available commands", out)
-
     def test_H4_exit(self):
-        app = FridgeSavvyApp()
-        buffer = io.StringIO()
-        sys_stdout = sys.stdout
-        sys.stdout = buffer
-        try:
-            result = app.handle_command("exit")
-        finally:
-            sys.stdout = sys_stdout
+        with redirect_stdout(_NULL):
+            result = self.app.handle_command("exit")
         self.assertFalse(result)
 
     def test_B1_create_recipe(self):
@@ -70,10 +186,6 @@ class TestFridgeSavvyIteration8(unittest.TestCase):
         self.assertIn("Created empty recipe 'Pasta'", out)
         self.assertIn("Pasta", app.recipes)
 
-    def test_B2_create_recipe_twice(self):
-        out, _ = self.run_cmds(["create recipe Pasta", "create recipe Pasta"])
-        self.assertIn("already exists", out)
-
     def test_B3_remove_recipe(self):
         out, app = self.run_cmds([
             "create recipe Pasta",
@@ -82,351 +194,123 @@ class TestFridgeSavvyIteration8(unittest.TestCase):
         self.assertNotIn("Pasta", app.recipes)
         self.assertIn("Removed recipe 'Pasta'", out)
 
-    def test_B4_remove_missing_recipe(self):
-        out, _ = self.run_cmds(["remove recipe NOPE"])
-        self.assertIn("No recipe named", out)
-
     def test_C1_add_ingredient_ok(self):
-        out, app = self.run_cmds([
-            "create recipe Salad",
-            "add ingredient Salad Tomato 100 g"
-        ])
+        out, app = self.run_cmds(CMDS_ADD_INGREDIENT)
         self.assertIn("Added ingredient 'Tomato'", out)
         self.assertIn("Tomato", app.recipes["Salad"])
 
-    def test_C2_add_ingredient_missing_recipe(self):
-        out, _ = self.run_cmds(["add ingredient Missing Tomato 100 g"])
-        self.assertIn("does not exist", out)
-
     def test_C3_remove_existing_ingredient(self):
-        out, app = self.run_cmds([
-            "create recipe Salad",
-            "add ingredient Salad Tomato 100 g",
-            "remove ingredient Salad Tomato"
-        ])
+        out, app = self.run_cmds(CMDS_ADD_REMOVE_INGREDIENT)
         self.assertIn("Removed ingredient", out)
         self.assertNotIn("Tomato", app.recipes["Salad"])
 
-    def test_C4_remove_missing_ingredient(self):
-        out, _ = self.run_cmds([
-            "create recipe Salad",
-            "remove ingredient Salad Tomato"
-        ])
-        self.assertIn("has no ingredient", out)
-
     def test_D1_plan_ok(self):
-        out, app = self.run_cmds([
-            "create recipe Soup",
-            "plan Soup 2025-10-10"
-        ])
+        out, app = self.run_cmds(CMDS_PLAN_SOUP)
         self.assertIn("Planned recipe", out)
         self.assertEqual(len(app.meal_plan), 1)
 
-    def test_D2_plan_missing_recipe(self):
-        out, _ = self.run_cmds(["plan Missing 2025-10-10"])
-        self.assertIn("does not exist", out)
-
     def test_D3_unplan_ok(self):
-        out, app = self.run_cmds([
-            "create recipe Soup",
-            "plan Soup 2025-10-10",
-            "unplan Soup 2025-10-10"
-        ])
-        self.assertIn("Removed planned recipe", out)
+        # The unplan message is checked by test_I2_unplan_boucle
+        app = _run_quiet(self.app, CMDS_PLAN_UNPLAN_SOUP)
         self.assertEqual(len(app.meal_plan), 0)
 
-    def test_D4_unplan_missing(self):
-        out, _ = self.run_cmds([
-            "create recipe Soup",
-            "unplan Soup 2025-10-10"
-        ])
-        self.assertIn("No planned recipe", out)
-
-    def test_E1_list_pantry_empty(self):
-        out, _ = self.run_cmds(["list pantry"])
-        self.assertIn("Pantry is empty", out)
-
-    def test_E3_list_recipe_empty(self):
-        out, _ = self.run_cmds([
-            "create recipe Empty",
-            "list recipe Empty"
-        ])
-        self.assertIn("has no ingredients", out)
-
-    def test_E4_list_recipe_missing(self):
-        out, _ = self.run_cmds(["list recipe Nope"])
-        self.assertIn("No recipe named", out)
-
-    def test_E5_list_expiring_none(self):
-        out, _ = self.run_cmds(["list expiring"])
-        self.assertIn("No items expiring", out)
-
-    def test_F1_no_recipes(self):
-        out, _ = self.run_cmds(["suggest recipes"])
-        self.assertIn("No recipes available", out)
-
-    def test_F3_recipe_suggested(self):
-        today = date.today()
-        future = today + timedelta(days=5)
-        out, _ = self.run_cmds([
-            "add Tomato Veg %s" % future,
-            "create recipe Pasta",
-            "add ingredient Pasta Tomato 1 g",
-            "suggest recipes"
-        ])
-        self.assertIn("Pasta", out)
-
-    def test_F4_recipe_not_suggested_missing_ing(self):
+    def test_I2_list_expiring(self):
+        date_today = FridgeSavvyApp._today()
         out, _ = self.run_cmds([
-            "create recipe Pasta",
-            "add ingredient Pasta Tomato 1 g",
-            "suggest recipes"
+            f"add Milk Dairy {date_today}",
+            "list expiring"
         ])
-        self.assertIn("Pantry is empty or all items are expired. No recipe suggestions.", out)
-
-    def test_G1_no_plans(self):
-        out, _ = self.run_cmds(["generate list"])
-        self.assertIn("Shopping list is empty.", out)
+        self.assertIn("Milk (Dairy) – Expires", out)
 
-    def test_G2_no_recipes_defined(self):
+    def test_I8_list_pantry_sorted_by_expiry(self):
+        """Covers the sorted pantry: out of order adds, ties keep add order."""
         out, _ = self.run_cmds([
-            "plan Soup 2025-10-10"
+            "add Cheese Dairy 2025-12-01",
+            "add Milk Dairy 2025-11-01",
+            "add Bread Bakery 2025-12-01",
+            "add Eggs Dairy 2025-11-15",
+            "add Apple Fruit 2025-12-01",
+            "list pantry",
         ])
-        self.assertIn("Recipe 'Soup' does not exist", out)
-
-    def test_G4_missing_ingredient(self):
-        out, _ = self.run_cmds([
-            "create recipe Pasta",
-            "add ingredient Pasta Tomato 2 g",
-            "plan Pasta 2025-10-10",
-            "generate list"
+        self.assertEqual(out.splitlines()[-5:], [
+            "- Milk (Dairy) – Expires 2025-11-01",
+            "- Eggs (Dairy) – Expires 2025-11-15",
+            "- Cheese (Dairy) – Expires 2025-12-01",
+            "- Bread (Bakery) – Expires 2025-12-01",
+            "- Apple (Fruit) – Expires 2025-12-01",
         ])
-        self.assertIn("Tomato", out)
-
-    def test_H1_unknown_command(self):
-        out, _ = self.run_cmds(["foobar"])
-        self.assertIn("Unknown command", out)
-
-    def test_A2_add_invalid_date(self):
-        out, _ = self.run_cmds(["add Milk Dairy WRONG"])
-        self.assertIn("Invalid date", out)
 
-    def test_I2_add_missing_arguments(self):
-        out, _ = self.run_cmds(["add"])
-        self.assertIn("Incomplete 'add' command", out)
-
-    def test_I2_add_wrong_arguments(self):
-        out, _ = self.run_cmds([
-            "create recipe Crepes",
-            "add ingredient Crepes Egg Two Unit"
+    def test_I8_list_expiring_window_bounds(self):
+        """Covers the expiring slice: today and today+3 in, either side out."""
+        with patch.object(FridgeSavvyApp, "_today", return_value=date(2025, 10, 1)):
+            out, _ = self.run_cmds([
+                "add Old Dairy 2025-09-30",
+                "add Late Dairy 2025-10-05",
+                "add Edge Dairy 2025-10-04",
+                "add Now Dairy 2025-10-01",
+                "list expiring",
+            ])
+        self.assertEqual(out.splitlines()[-3:], [
+            "Items expiring between 2025-10-01 and 2025-10-04:",
+            "- Now (Dairy) – Expires 2025-10-01 (in 0 day(s))",
+            "- Edge (Dairy) – Expires 2025-10-04 (in 3 day(s))",
         ])
-        self.assertIn("Expected a number.", out)
-
-    def test_I2_add_pantry_wrong_arg_count(self):
-        out, _ = self.run_cmds(["add Milk Dairy"])
-        self.assertIn("Usage: add ", out)
-
-    def test_I2_add_ingredient_wrong_arg_count(self):
-        out, _ = self.run_cmds([""])
-        self.assertIn("Enter a command", out)
-
-    def test_I2_add_ingredient_too_many_args(self):
-        out, _ = self.run_cmds(["add ingredient R I Q U More"])
-        self.assertIn("Usage: add ingredient ", out)
 
-    def test_I2_remove_no_arguments(self):
-        out, _ = self.run_cmds(["remove"])
-        self.assertIn("Incomplete 'remove' command", out)
-
-    def test_I2_remove_too_many_args(self):
-        out, _ = self.run_cmds(["remove egg bread"])
-        self.assertIn("Usage: ", out)
-
-    def test_I2_remove_recipe_missing_name(self):
-        out, _ = self.run_cmds(["remove recipe"])
-        self.assertIn("Usage: remove recipe", out)
-
-    def test_I2_remove_ingredient_missing_name(self):
-        out, _ = self.run_cmds(["remove ingredient R"])
-        self.assertIn("Usage: remove ingredient", out)
-
-    def test_I2_remove_ingredient_wrong_recipe_name(self):
-        out, _ = self.run_cmds(["remove ingredient R egg"])
-        self.assertIn("No recipe named", out)
-
-    def test_I2_create_wrong_usage(self):
-        out, _ = self.run_cmds(["create"])
-        self.assertIn("Usage: create recipe", out)
-
-    def test_I2_create_recipe_missing_name(self):
-        out, _ = self.run_cmds(["create recipe"])
-        self.assertIn("Usage: create recipe", out)
-
-    def test_I2_plan_missing_arguments(self):
-        out, _ = self.run_cmds(["plan Soup"])
-        self.assertIn("Usage: plan", out)
-
-    def test_I2_plan_invalid_date(self):
-        out, _ = self.run_cmds([
-            "create recipe Soup",
-            "plan Soup abc"
-        ])
-        self.assertIn("Invalid date", out)
-
-    def test_I2_unplan_missing_arguments(self):
-        out, _ = self.run_cmds(["unplan Soup"])
-        self.assertIn("Usage: unplan", out)
-
-    def test_I2_unplan_invalid_date(self):
-        out, _ = self.run_cmds(["unplan Soup bad-date"])
-        self.assertIn("Invalid date", out)
-
-    def test_I2_list_invalid_subcommand(self):
-        out, _ = self.run_cmds(["list wrong"])
-        self.assertIn("Unknown 'list' command", out)
-
-    def test_I2_list_recipe_wrong_usage(self):
-        out, _ = self.run_cmds(["list recipe"])
-        self.assertIn("Usage: list recipe", out)
-
-    def test_I2_list_expiring_too_many_args(self):
-        out, _ = self.run_cmds(["list expiring now"])
-        self.assertIn("Usage: list expiring", out)
-
-    def test_I2_list_too_few_args(self):
-        out, _ = self.run_cmds(["list"])
-        self.assertIn("Usage: list pantry |", out)
-
-    def test_I2_list_pantry_too_many_args(self):
-        out, _ = self.run_cmds(["list pantry pantry"])
-        self.assertIn("Usage: list pantry", out)
-
-    def test_I2_list_pantry(self):
-        out, _ = self.run_cmds([
-            "add Milk Dairy 2025-11-01",
-            "list pantry"
+    def test_I8_unplan_then_remove_recipe(self):
+        """Covers the plan indexes: unplanning the only date, then removing."""
+        out, app = self.run_cmds([
+            "create recipe Omelette",
+            "plan Omelette 2025-12-01",
+            "unplan Omelette 2025-12-01",
+            "remove recipe Omelette",
         ])
-        self.assertIn("Milk (Dairy) – Expires 2025-11-01", out)
+        self.assertEqual(out.splitlines()[-1], "Removed recipe 'Omelette'.")
+        self.assertEqual(app.meal_plan, {})
 
-    def test_I2_list_recipe(self):
-        out, _ = self.run_cmds([
+    def test_I8_duplicate_plans(self):
+        """Covers the plan indexes: the same recipe planned twice on one date."""
+        app = _run_quiet(self.app, (
             "create recipe Soup",
-            "add ingredient Soup tomato 1 unit",
-            "list recipe Soup"
+            "add ingredient Soup Tomato 2 unit",
+            "plan Soup 2025-12-01",
+            "plan Soup 2025-12-01",
+            "plan Soup 2025-12-02",
+            "unplan Soup 2025-12-01",
+        ))
+        sink = _sink()
+        self.assertIn("- Tomato – 4 unit", _capture(app, ["generate list"], sink))
+        out = _capture(app, ["unplan Soup 2025-12-01", "unplan Soup 2025-12-01"], sink)
+        self.assertEqual(out.splitlines(), [
+            "Removed planned recipe 'Soup' on 2025-12-01.",
+            "No planned recipe 'Soup' on 2025-12-01 found.",
         ])
-        self.assertIn("tomato – 1.0 unit", out)
-
-    def test_I2_list_expiring(self):
-        date_today = FridgeSavvyApp()._today()
-        out, _ = self.run_cmds([
-            f"add Milk Dairy {date_today}",
-            "list expiring"
-        ])
-        self.assertIn("Milk (Dairy) – Expires", out)
-
-    def test_I2_suggest_wrong_usage_missing_keyword(self):
-        out, _ = self.run_cmds(["suggest"])
-        self.assertIn("Usage: suggest recipes", out)
-
-    def test_I2_suggest_wrong_usage_recipe(self):
-        out, _ = self.run_cmds(["suggest recipe"])
-        self.assertIn("Usage: suggest recipes", out)
-
-    def test_I2_suggest_recipe_empty_ingredient_list(self):
-        out, _ = self.run_cmds([
-            "create recipe EmptyStar",
-            "add Egg Dairy 2099-01-01",
-            "suggest recipes"
-        ])
-        self.assertIn("No recipes can be fully prepared with current pantry items.", out)
+        _capture(app, ["plan Soup 2025-12-01", "plan Soup 2025-12-01"], sink)
+        out = _capture(app, ["remove recipe Soup"], sink)
+        self.assertEqual(
+            out, "Removed recipe 'Soup'. Also removed 3 planned occurrence(s).\n"
+        )
+        self.assertEqual(app.meal_plan, {})
 
     def test_I2_suggest_recipe_loop(self):
-        out, _ = self.run_cmds([
-            "create recipe Tortilla",
-            "create recipe Cake",
-            "create recipe Snails",
-            "add ingredient Cake Egg 3 unit",
-            "add ingredient Tortilla Potatoes 4 kg",
-            "add ingredient Tortilla Egg 4 unit",
-            "add Egg Dairy 2099-01-01",
-            "suggest recipes"
-        ])
+        app = deepcopy(seeded("cake_tortilla_snails"))
+        out = _capture(app, ["suggest recipes"], _sink())
         self.assertIn("You can prepare the following recipes with your current pantry:\n- Cake", out)
 
-    def test_I2_generate_wrong_usage_missing_keyword(self):
-        out, _ = self.run_cmds(["generate"])
-        self.assertIn("Usage: generate list", out)
-
-    def test_I2_generate_wrong_usage_extra_args(self):
-        out, _ = self.run_cmds(["generate list extra"])
-        self.assertIn("Usage: generate list", out)
-
     def test_I2_generate_list_meal_plan_but_recipe_missing(self):
-        out, app = self.run_cmds([
-            "create recipe Pasta",
-            "create recipe Soup",
-            "add ingredient Pasta Tomato 2 g",
-            "plan Pasta 2025-10-10",
-            "remove recipe Pasta",
-            "generate list"
-        ])
+        app = deepcopy(seeded("pasta_planned_then_removed"))
+        out = _capture(app, ["generate list"], _sink())
         self.assertIn("No meals planned. Shopping list is empty.", out)
 
-    def test_I2_generate_list_no_recipe(self):
-        out, app = self.run_cmds([
-            "generate list"
-        ])
-        self.assertIn("No recipes defined. Shopping list is empty.", out)
-
     def test_I2_no_missing_ingredient(self):
-        out, _ = self.run_cmds([
-            "create recipe Pasta",
-            "add ingredient Pasta Tomato 2 g",
-            "add ingredient Pasta Butter 50 g",
-            "add Butter Dairy 2025-12-01",
-            "add Tomato Vegetable 2025-12-03",
-            "plan Pasta 2025-10-10",
-            "generate list"
-        ])
+        app = deepcopy(seeded("pasta_planned_with_pantry"))
+        out = _capture(app, ["generate list"], _sink())
         self.assertIn("Tomato", out)
 
-    def test_I2_remove_when_several_itemsin_the_pantry(self):
-        out, _ = self.run_cmds([
-            "add Milk Dairy 2025-11-01",
-            "add Bread Bakery 2025-11-11",
-            "add Tomato Vegetables 2025-11-12",
-            "remove Bread"
-        ])
-        self.assertIn("Removed item", out)
-
     def test_I2_unplan_boucle(self):
-        out, _ = self.run_cmds([
-            "create recipe Soup",
-            "create recipe Cake",
-            "create recipe Snails",
-            "plan Soup 2025-11-28",
-            "plan Cake 2025-11-15",
-            "plan Snails 2025-12-01",
-            "unplan Cake 2025-11-15"
-        ])
+        app = deepcopy(seeded("soup_cake_snails_planned"))
+        out = _capture(app, ["unplan Cake 2025-11-15"], _sink())
         self.assertIn("Removed planned recipe", out)
 
-    def test_I2_unknown_full_command(self):
-        out, _ = self.run_cmds(["blablabla"])
-        self.assertIn("Unknown command", out)
-
-    def test_startup_banner(self):
-        proc = subprocess.Popen(
-            [sys.executable, MAIN],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        out, err = proc.communicate("exit\n")
-        self.assertIn("FridgeSavvy – Smart kitchen inventory", out)
-        self.assertIn("Type 'help' to see available commands.", out)
-
     # --------------------------
     # NEW IN ITERATION 8
     # Final 3% Coverage - Targeting lines 653, 704-718, 722
@@ -434,17 +318,8 @@ class TestFridgeSavvyIteration8(unittest.TestCase):
 
     def test_I8_all_ingredients_available_no_shopping_needed(self):
         """Covers lines 678-693: All planned ingredients already in pantry."""
-        today = date.today()
-        future = today + timedelta(days=30)
-        out, _ = self.run_cmds([
-            "create recipe Pasta",
-            "add ingredient Pasta Tomato 200 g",
-            "add ingredient Pasta Cheese 50 g",
-            "add Tomato Vegetable " + str(future),
-            "add Cheese Dairy " + str(future),
-            "plan Pasta 2025-12-10",
-            "generate list"
-        ])
+        app = deepcopy(seeded("pasta_all_available"))
+        out = _capture(app, ["generate list"], _sink())
         self.assertIn("All planned ingredients are already available", out)
 
     def test_I8_generate_list_with_recipe_no_ingredients(self):
@@ -459,81 +334,214 @@ class TestFridgeSavvyIteration8(unittest.TestCase):
 
     def test_I8_multiple_ingredients_mixed_availability(self):
         """Covers line 653 and shopping list accumulation."""
-        today = date.today()
-        future = today + timedelta(days=30)
-        out, _ = self.run_cmds([
-            "create recipe Salad",
-            "add ingredient Salad Lettuce 1 head",
-            "add ingredient Salad Tomato 2 unit",
-            "add Lettuce Vegetable " + str(future),
-            "plan Salad 2025-12-10",
-            "generate list"
-        ])
+        app = deepcopy(seeded("salad_half_available"))
+        out = _capture(app, ["generate list"], _sink())
         # Check shopping list specifically
         self.assertIn("Tomato", out)
         # Verify Lettuce is NOT in the shopping list section
-        shopping_list_section = out.split("Shopping list")[1] if "Shopping list" in out else out
-        self.assertNotIn("Lettuce –", shopping_list_section)
+        before, found, shopping_list_section = out.partition("Shopping list")
+        self.assertNotIn("Lettuce –", shopping_list_section if found else before)
+
+    def test_I8_generate_list_recipe_planned_several_times(self):
+        """Covers generate list: quantities are multiplied by the plan count."""
+        out, _ = self.run_cmds([
+            "create recipe Soup",
+            "add ingredient Soup Tomato 2 unit",
+            "create recipe Salad",
+            "add ingredient Salad Tomato 1 unit",
+            "add ingredient Salad Oil 5 ml",
+            "plan Soup 2025-12-01",
+            "plan Soup 2025-12-02",
+            "plan Soup 2025-12-03",
+            "plan Salad 2025-12-02",
+            "generate list",
+        ])
+        self.assertEqual(out.splitlines()[-3:], [
+            "Shopping list (missing ingredients for planned meals):",
+            "- Oil – 5 ml",
+            "- Tomato – 7 unit",
+        ])
+
+    def test_I8_generate_list_fractional_total(self):
+        """Covers generate list: quantities are added one planned meal at a
+        time, so ten plans of 0.1 g total just under 1 g and print 0 g."""
+        commands = ["create recipe Tea", "add ingredient Tea Leaf 0.1 g"]
+        commands += ["plan Tea 2025-12-%02d" % day for day in range(1, 11)]
+        commands.append("generate list")
+        out, _ = self.run_cmds(commands)
+        self.assertIn("- Leaf – 0 g", out)
+
+    def test_I8_generate_list_nan_quantity(self):
+        """Covers generate list: lines before an unprintable quantity are
+        written before the error."""
+        out, _ = self.run_cmds([
+            "create recipe Tea",
+            "add ingredient Tea Apple 1 unit",
+            "add ingredient Tea Leaf nan g",
+            "plan Tea 2025-12-01",
+            "generate list",
+        ])
+        self.assertEqual(out.splitlines()[-3:], [
+            "Shopping list (missing ingredients for planned meals):",
+            "- Apple – 1 unit",
+            "Error: cannot convert float NaN to integer",
+        ])
 
     def test_I8_main_function_with_eof(self):
-        """Covers lines 704-722: Main function interactive loop with EOF."""
-        proc = subprocess.Popen(
-            [sys.executable, MAIN],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        out, err = proc.communicate("")
+        """Covers main() in batch mode: empty input prints the banner and goodbye."""
+        out = _run_main("", _sink())
         self.assertIn("FridgeSavvy", out)
+        self.assertTrue(out.endswith("to quit.\nGoodbye!\n"))
 
     def test_I8_main_function_normal_command(self):
-        """Covers lines 704-722: Main function with normal command execution."""
-        proc = subprocess.Popen(
-            [sys.executable, MAIN],
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-        )
-        out, err = proc.communicate("help\nexit\n")
+        """Covers main() in batch mode: piped commands run until 'exit'."""
+        out = _run_main("help\nexit\n", _sink())
         self.assertIn("Available commands", out)
         self.assertIn("Goodbye", out)
 
+    def test_I8_main_interactive_until_eof(self):
+        """Covers main() at a terminal: prompts for each line until EOF."""
+        out, prompt = _run_main_interactive(["help", "list pantry"], _sink())
+        self.assertEqual(prompt.call_count, 3)
+        prompt.assert_called_with("> ")
+        self.assertIn("Available commands", out)
+        self.assertIn("Pantry is empty.", out)
+        self.assertTrue(out.endswith("Pantry is empty.\n\nGoodbye!\n"))
+
+    def test_I8_main_interactive_exit(self):
+        """Covers main() at a terminal: 'exit' stops prompting."""
+        out, prompt = _run_main_interactive(["exit", "help"], _sink())
+        self.assertEqual(prompt.call_count, 1)
+        self.assertTrue(out.endswith("to quit.\nGoodbye!\n"))
+        self.assertNotIn("Available commands", out)
+
+    def test_I8_handle_commands_runs_every_line(self):
+        """Covers batch handling without 'exit': every line runs."""
+        app = self.app
+        app.reset()
+        with redirect_stdout(_NULL):
+            finished = app.handle_commands(("create recipe Soup", "create recipe Cake"))
+        self.assertTrue(finished)
+        self.assertEqual(list(app.recipes), ["Soup", "Cake"])
+
+    def test_I8_command_pattern_agrees_with_trie(self):
+        """Covers dispatch: the pattern matches exactly the lines the trie
+        resolves to a command with the right token count."""
+        app = self.app
+        commands = app._COMMANDS
+        self.assertEqual(sorted(app._COMMAND_GROUPS.values()), sorted(commands))
+        seconds = {"", "x"}
+        for node in app._COMMAND_TRIE.values():
+            seconds.update(node.subcommands)
+        for verb, node in app._COMMAND_TRIE.items():
+            lines = [verb]
+            for second in seconds:
+                lines += [" ".join([verb, second] + ["x"] * n) for n in range(6)]
+            for line in lines:
+                try:
+                    name = app._resolve_command(verb, node, line)
+                except ValueError:
+                    name = None
+                if name is not None and commands[name].token_count != len(line.split(" ")):
+                    name = None
+                match = app._COMMAND_RE.fullmatch(line)
+                matched = app._COMMAND_GROUPS[match.lastgroup] if match else None
+                self.assertEqual(matched, name, line)
+
+    @unittest.skipUnless(os.environ.get("FRIDGESAVVY_SLOW_TESTS"),
+                         "set FRIDGESAVVY_SLOW_TESTS to run timing tests")
+    def test_I8_dispatch_throughput(self):
+        """Guards against dispatch regressions: 8000 commands in under 0.2 s.
+
+        They take about 20 ms, so the bound leaves room for slow machines
+        but fails on per-line work an order of magnitude larger, such as
+        rebuilding the command table or pattern for every line.
+        """
+        app = self.app
+        app.reset()
+        start = time.perf_counter()
+        with redirect_stdout(_NULL):
+            app.handle_commands(CMDS_DISPATCH * 1000)
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 0.2)
+
     def test_I8_suggest_with_expired_items(self):
         """Covers lines 581-607: Suggest recipes with mix of expired and valid items."""
-        today = date.today()
-        past = today - timedelta(days=10)  # Clearly expired
-        future = today + timedelta(days=30)  # Clearly valid
-        out, _ = self.run_cmds([
-            "add Egg Dairy " + str(past),
-            "add Tomato Vegetable " + str(future),
-            "create recipe Omelette",
-            "add ingredient Omelette Egg 2 unit",
-            "create recipe Salad",
-            "add ingredient Salad Tomato 1 unit",
-            "suggest recipes"
-        ])
+        app = deepcopy(seeded("omelette_egg_expired"))
+        out = _capture(app, ["suggest recipes"], _sink())
         # Should only suggest Salad (has valid Tomato), not Omelette (has expired Egg)
         self.assertIn("Salad", out)
         # Check that Omelette is not in the suggestions section
-        if "You can prepare the following recipes" in out:
-            suggestions_section = out.split("You can prepare the following recipes")[1]
+        _, found, suggestions_section = out.partition("You can prepare the following recipes")
+        if found:
             self.assertNotIn("Omelette", suggestions_section)
 
     def test_I8_recipe_with_multiple_ingredients_partial_match(self):
         """Covers line 614: Recipe matching logic with partial ingredients."""
-        today = date.today()
-        future = today + timedelta(days=5)
-        out, _ = self.run_cmds([
-            "add Tomato Vegetable " + str(future),
-            "create recipe ComplexPasta",
-            "add ingredient ComplexPasta Tomato 1 unit",
-            "add ingredient ComplexPasta Cheese 1 unit",
-            "add ingredient ComplexPasta Pasta 1 unit",
-            "suggest recipes"
-        ])
+        app = deepcopy(seeded("complex_pasta_partial"))
+        out = _capture(app, ["suggest recipes"], _sink())
         self.assertIn("No recipes can be fully prepared", out)
 
+    def test_I8_suggest_and_generate_after_pantry_changes(self):
+        """Covers the available-names cache: pantry edits between runs."""
+        app = _run_quiet(self.app, (
+            "add Egg Dairy %s" % FUTURE_5,
+            "add Milk Dairy %s" % FUTURE_5,
+            "create recipe Omelette",
+            "add ingredient Omelette Egg 1 unit",
+            "plan Omelette 2025-12-01",
+        ))
+        sink = _sink()
+        self.assertIn("- Omelette", _capture(app, ["suggest recipes"], sink))
+        self.assertIn("No shopping needed", _capture(app, ["generate list"], sink))
+
+        _capture(app, ["remove Egg"], sink)
+        self.assertIn("No recipes can be fully prepared",
+                      _capture(app, ["suggest recipes"], sink))
+        self.assertIn("- Egg – 1 unit", _capture(app, ["generate list"], sink))
+
+        _capture(app, ["add Egg Dairy %s" % FUTURE_5], sink)
+        self.assertIn("- Omelette", _capture(app, ["suggest recipes"], sink))
+        self.assertIn("No shopping needed", _capture(app, ["generate list"], sink))
+
+    def test_I8_suggest_after_ingredient_changes(self):
+        """Covers the recipe mask cache: ingredient edits between suggestions."""
+        app = _run_quiet(self.app, (
+            "add Egg Dairy %s" % FUTURE_5,
+            "create recipe Omelette",
+            "add ingredient Omelette Egg 2 unit",
+        ))
+        sink = _sink()
+        self.assertIn("- Omelette", _capture(app, ["suggest recipes"], sink))
+
+        _capture(app, ["add ingredient Omelette Cheese 50 g"], sink)
+        self.assertIn("No recipes can be fully prepared",
+                      _capture(app, ["suggest recipes"], sink))
+
+        _capture(app, ["remove ingredient Omelette Cheese"], sink)
+        self.assertIn("- Omelette", _capture(app, ["suggest recipes"], sink))
+
+    def test_I8_generate_list_after_ingredient_changes(self):
+        """Covers the ingredient arrays: edits between shopping lists."""
+        app = _run_quiet(self.app, (
+            "create recipe Omelette",
+            "add ingredient Omelette Egg 2 unit",
+            "plan Omelette 2025-12-01",
+        ))
+        sink = _sink()
+        out = _capture(app, ["generate list"], sink)
+        self.assertIn("- Egg – 2 unit", out)
+        self.assertNotIn("Cheese", out)
+
+        _capture(app, ["add ingredient Omelette Cheese 50 g"], sink)
+        out = _capture(app, ["generate list"], sink)
+        self.assertIn("- Cheese – 50 g", out)
+        self.assertIn("- Egg – 2 unit", out)
+
+        _capture(app, ["remove ingredient Omelette Egg"], sink)
+        out = _capture(app, ["generate list"], sink)
+        self.assertIn("- Cheese – 50 g", out)
+        self.assertNotIn("Egg", out)
+
 if __name__ == "__main__":
     unittest.main()